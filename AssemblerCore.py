@@ -0,0 +1,205 @@
+import io
+import os
+import Tracing
+from ISACompiler import CompiledISA, compile_isa, load_isa
+from PeepholeOptimizer import optimize as optimize_statements
+from ProgramImage import ProgramImage
+
+class AssemblyException(Exception):
+    """
+    Exceção personalizada para erros no processo de montagem de código.
+    """
+    def __init__(self, message, line):
+        super().__init__(message)
+        self.line = line
+
+    def __str__(self):
+        return f"ERROR LINE {self.line}: {super().__str__()}"
+
+class AssemblyResult:
+    """
+    Resultado de uma montagem: imagem do programa, rótulos e erros estruturados.
+    """
+    def __init__(self, image, labels, errors, optimization=None):
+        self.image = image      # ProgramImage com as palavras e o mapa de linhas
+        self.labels = labels    # Rótulo -> endereço
+        self.errors = errors    # Lista de AssemblyException
+        self.optimization = optimization    # OptimizationReport, se montado com optimize=True
+
+    @property
+    def ok(self):
+        return not self.errors
+
+def strip_comments(lines):
+    """Gera (linha, código) das linhas não vazias, sem comentários."""
+    for line_number, line in enumerate(lines, start=1):
+        line = line.split(";")[0].strip()  # Remove comentários do código
+        if line:
+            yield line_number, line
+
+def tokenize(lines):
+    """Gera (linha, rótulo, instrução, operando); rótulo é None nas linhas de instrução."""
+    for line_number, line in lines:
+        if ":" in line:  # Definição de rótulo
+            yield line_number, line.split(":")[0].strip(), None, None
+        else:
+            parts = line.split()
+            yield line_number, None, parts[0], parts[1] if len(parts) > 1 else None
+
+class AssemblerCore:
+    """
+    Montador independente de interface gráfica.
+    """
+
+    def __init__(self, isa):
+        """
+        :param isa: CompiledISA ou configuração de ISA (dict do JSON), que é validada e compilada
+        """
+        self.isa = isa if isinstance(isa, CompiledISA) else compile_isa(isa)
+
+    @staticmethod
+    def load_isa(file_path):
+        """Carrega e compila uma ISA a partir de um arquivo JSON (com cache por conteúdo)."""
+        return load_isa(file_path)
+
+    def assemble_file(self, file_path, encoding="latin-1", optimize=False):
+        """Monta um arquivo .asm (os exemplos do projeto usam Latin-1)."""
+        return self.assemble_stream(file_path, encoding, optimize)
+
+    def assemble(self, source, optimize=False):
+        """
+        Monta o código-fonte e retorna um AssemblyResult.
+
+        :param source: Código Assembly (string).
+        :param optimize: Aplica a otimização peephole (ver PeepholeOptimizer).
+        :return: AssemblyResult com as palavras montadas e todos os erros encontrados.
+        """
+        return self.assemble_stream(io.StringIO(source), optimize=optimize)
+
+    def assemble_stream(self, source, encoding="latin-1", optimize=False):
+        """
+        Montagem em uma única passagem sobre um fluxo de linhas.
+
+        Os estágios (leitura, remoção de comentários, tokenização) são geradores,
+        de modo que apenas a tabela de rótulos e a imagem ficam em memória.
+        As referências a rótulos são remendadas no final (vale a última definição).
+
+        :param source: Caminho de um arquivo .asm ou qualquer iterável de linhas.
+        :param encoding: Codificação usada quando source é um caminho.
+        :param optimize: Aplica a otimização peephole entre a tokenização e a resolução dos rótulos.
+        :return: AssemblyResult com as palavras montadas e todos os erros encontrados.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'r', encoding=encoding) as file:
+                return self.assemble_stream(file, optimize=optimize)
+
+        tokens = tokenize(strip_comments(source))
+        if not optimize:
+            return self.assemble_tokens(tokens)
+
+        # As tuplas otimizadas mantêm a linha original: uma única codificação reporta os erros
+        tokens = list(tokens)
+        with Tracing.span("assemble.optimize", statements=len(tokens)) as trace:
+            optimized, report = optimize_statements(tokens)
+            trace.set(words_before=report.words_before, words_after=report.words_after)
+        result = self.assemble_tokens(optimized)
+        result.optimization = report
+
+        # Instruções removidas ou reescritas pela otimização são verificadas como no original
+        kept = set(optimized)
+        for line_number, label, instr, operand in tokens:
+            if label is None and (line_number, label, instr, operand) not in kept:
+                try:
+                    if self.lookup(instr, line_number)[1]:
+                        self.operand_value(instr, operand, line_number, result.labels)
+                except AssemblyException as e:
+                    result.errors.append(e)
+        result.errors.sort(key=lambda error: error.line)
+        return result
+
+    def assemble_tokens(self, tokens):
+        """Resolve os rótulos e codifica as tuplas (linha, rótulo, instrução, operando)."""
+        label_addresses = {}
+        fixups = []             # (posição na imagem, rótulo, linha) das referências a rótulos
+        errors = []
+        image = ProgramImage()
+        registers = self.isa.registers
+        address = 0             # Instruções lidas (inclusive as com erro, que não entram na imagem)
+
+        # Primeira passagem: leitura, tokenização e codificação (os estágios são geradores)
+        with Tracing.span("assemble.encode") as trace:
+            for line_number, label, instr, operand in tokens:
+                if label is not None:  # Definição de rótulo
+                    label_addresses[label] = address  # Armazena o endereço do rótulo
+                    continue  # Rótulos não geram instruções
+
+                address += 1
+
+                try:
+                    opcode_bits, has_operand = self.lookup(instr, line_number)
+                    if not has_operand:
+                        word = opcode_bits
+                    elif operand is not None and operand not in registers and not operand.isdigit():
+                        # Rótulo: resolvido após a leitura de todo o fluxo
+                        fixups.append((len(image), operand, line_number))
+                        word = opcode_bits
+                    else:
+                        word = opcode_bits | self.operand_value(instr, operand, line_number, label_addresses)
+                except AssemblyException as e:
+                    errors.append(e)
+                    continue
+                image.append(word, line_number)
+            trace.set(words=len(image), labels=len(label_addresses), fixups=len(fixups))
+
+        with Tracing.span("assemble.fixups", fixups=len(fixups)):
+            # Remendo das referências a rótulos (de trás para frente: remover uma
+            # palavra com erro não desloca os remendos pendentes)
+            for index, label, line_number in reversed(fixups):
+                try:
+                    image.words[index] |= self.operand_value(None, label, line_number, label_addresses)
+                except AssemblyException as e:
+                    errors.append(e)
+                    del image.words[index]
+                    del image.source_lines[index]
+
+        errors.sort(key=lambda error: error.line)
+        return AssemblyResult(image, label_addresses, errors)
+
+    def encode(self, line, line_number, label_addresses):
+        """Converte uma instrução em uma palavra de 16 bits."""
+
+        parts = line.split()
+        instr = parts[0]
+        operand = parts[1] if len(parts) > 1 else None
+
+        opcode_bits, has_operand = self.lookup(instr, line_number)
+        if not has_operand:  # Sem operando
+            return opcode_bits
+
+        # Código de máquina completo de 16 bits
+        return opcode_bits | self.operand_value(instr, operand, line_number, label_addresses)
+
+    def lookup(self, instr, line_number):
+        """Retorna (opcode << 12, tem operando) de uma instrução."""
+        encoding = self.isa.encoding.get(instr)
+        if encoding is None:
+            raise AssemblyException(f"Invalid instruction {instr}", line_number)
+        return encoding
+
+    def operand_value(self, instr, operand, line_number, label_addresses):
+        """Resolve o operando (registrador, número ou rótulo) em um valor de 12 bits."""
+        if operand is None:
+            raise AssemblyException(f"Missing operand for {instr}", line_number)
+        elif operand in self.isa.registers:  # Operando é um registrador
+            operand_value = self.isa.registers[operand]
+        elif operand.isdigit():  # Operando é um número
+            operand_value = int(operand)
+        elif operand in label_addresses:  # Referência a um rótulo
+            operand_value = label_addresses[operand]
+        else:
+            raise AssemblyException(f"Invalid operand {operand}", line_number)
+
+        if operand_value >= 2**12:
+            raise AssemblyException(f"Operand {operand} out of 12-bit range", line_number)
+
+        return operand_value
@@ -1,61 +1,101 @@
 import tkinter as tk
-from tkinter import filedialog, Menu, messagebox
+from tkinter import filedialog, Menu, messagebox, simpledialog
 import tkinter.font as tkfont 
-from PIL import Image, ImageTk
-import ctypes
+import codecs
 import json
-import re
+import queue
+import sys
+import time
+import Tracing
 from Assembler import Assembler
+from Assets import load_image
+from Diagnostics import DiagnosticsWorker, ERROR, WARNING
+from FileIO import FileLoader, FileSaver
+from ISACompiler import ISAException, load_isa
+from SyntaxHighlighter import SyntaxHighlighter, build_token_regex
 
 class AssemblyEditor:
 
+    THEME_FILES = {True: "./configs/dark_theme.json", False: "./configs/light_theme.json"}
+
     def __init__(self, root):
 
         self.root = root
-        self.configure_root()
-        self.setup_icon()
+        self.startup_times = {}     # Etapa -> segundos gastos na inicialização (ver main.py --startup-time)
+        self.timed("root", self.configure_root)
+        self.timed("icon", self.setup_icon)
         self.setup_default_configs()
-        self.create_menu()
-        self.load_configuration_files()
-        self.setup_main_frame()
+        self.timed("menu", self.create_menu)
+        self.timed("config", self.load_configuration_files)
+        self.timed("widgets", self.setup_main_frame)
         self.bind_events()
 
+    def timed(self, step, function):
+        """Executa uma etapa da inicialização medindo o tempo gasto."""
+        start = time.perf_counter()
+        function()
+        self.startup_times[step] = time.perf_counter() - start
+
     def configure_root(self):
         """Configura a janela principal."""
 
         self.root.title("Assembly Editor")
         self.root.geometry("1600x1000")
-        ctypes.windll.shcore.SetProcessDpiAwareness(1)
+        if sys.platform == "win32":
+            import ctypes
+            ctypes.windll.shcore.SetProcessDpiAwareness(1)
         self.root.option_add("*Font", "Arial 14")
         self.root.bind("<Configure>", self.handle_resize)
 
     def setup_icon(self):
         """Define o ícone da janela."""
 
-        path = "assets/edit.png"
-        load = Image.open(path)
-        render = ImageTk.PhotoImage(load)
-        self.root.iconphoto(False, render)
+        self.root.iconphoto(False, load_image("assets/edit.png"))
 
     def setup_default_configs(self):
         """Configurações padrão."""
 
         self.font_size = 12  # Default font size
         self.dark_mode = True  # Default theme
+        self.resize_delay = 100  # Intervalo mínimo (ms) entre atualizações por redimensionamento
+        self.resize_after_id = None
+        self.assembler = None  # Reutilizado entre montagens (mantém a janela de listagem)
+        self.file_path = None  # Arquivo aberto/salvo (base dos .include relativos)
+        self.file_encoding = "utf-8"  # Codificação do arquivo aberto (mantida ao salvar)
+        self.file_newline = "\n"     # Quebra de linha do arquivo aberto (mantida ao salvar)
+        self.load_generation = 0     # Aberturas anteriores em andamento são descartadas
+        self.loading = False         # Texto incompleto: salvar e montar ficam bloqueados
+        self.loading_info = None     # (codificação, quebra de linha, linhas) do arquivo em carga
+        self.file_saver = None       # Thread de gravação, criada no primeiro salvamento
+        self.pending_saves = 0
+        self.optimize = tk.BooleanVar(value=False)  # Otimização peephole na montagem
+
+        # Diagnóstico em segundo plano
+        self.live_diagnostics = tk.BooleanVar(value=True)
+        self.diagnostics_delay = 400  # Tempo ocioso (ms) após a última edição
+        self.diagnostics_after_id = None
+        self.diagnostics_generation = 0  # Resultados de gerações anteriores são descartados
+        self.diagnostics_worker = None
 
     def setup_main_frame(self):
         """Configura o frame principal."""
 
-        self.main_frame = tk.Frame(self.root)
-        self.main_frame.pack(fill=tk.BOTH, expand=True)
-
         # Seleção de tema
         THEME = self.dark_theme if self.dark_mode else self.light_theme
 
+        # Barra de status (contagem de erros e avisos)
+        self.status_bar = tk.Label(self.root, anchor="w", padx=10, font=("Arial", 10),
+                                   background=THEME.get('line_number_bg'), foreground=THEME.get('line_number_fg'))
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+
+        self.main_frame = tk.Frame(self.root)
+        self.main_frame.pack(fill=tk.BOTH, expand=True)
+
         # Números de Linha
         self.line_numbers = tk.Text(self.main_frame, width=4, padx=15, takefocus=0, border=0, pady=15,
                                     background=THEME.get('line_number_bg'), foreground=THEME.get('line_number_fg'), state=tk.DISABLED)
         self.line_numbers.pack(side=tk.LEFT, fill=tk.Y)
+        self.gutter_lines = 0  # Quantidade de números exibidos no painel
 
         # Separador (uma linha vertical)
         self.separator = tk.Frame(self.main_frame, width=1, bg=THEME.get('line_separator'))
@@ -88,7 +128,12 @@ class AssemblyEditor:
 
         # Adiciona tags para destaque de sintaxe
         self.syntax_highlight_theme()
-        self.highlight_syntax()          
+        self.highlighter = SyntaxHighlighter(self.text_area, self.token_regex)
+        self.highlight_syntax()
+
+        # Marcação dos diagnósticos (acima das tags de sintaxe)
+        self.text_area.tag_configure(ERROR, underline=True, background="#5C1E1E")
+        self.text_area.tag_configure(WARNING, underline=True, background="#5C4B1E")
 
     def sync_scroll(self, *args):
         """Sincroniza a rolagem entre a área de texto e os números de linha."""
@@ -98,28 +143,55 @@ class AssemblyEditor:
         self.scrollbar.set(*args)
 
     def handle_resize(self, event=None):
-        """Mantém a posição de rolagem ao redimensionar."""
+        """Agrupa a rajada de eventos de redimensionamento em uma única atualização."""
+        if event is not None and event.widget is not self.root:
+            return  # <Configure> dos widgets filhos também chega pela janela principal
+        if self.resize_after_id is None:
+            self.resize_after_id = self.root.after(self.resize_delay, self.on_resize_done)
+
+    def on_resize_done(self):
+        """Mantém a posição de rolagem após o redimensionamento."""
+        self.resize_after_id = None
         self.update_line_numbers()
-        self.highlight_syntax()
+        self.line_numbers.yview_moveto(self.text_area.yview()[0])
 
     def load_configuration_files(self):
-        """Carrega os arquivos de configuração: esquemas de cores e ISA."""
+        """Carrega os arquivos de configuração: esquema de cores ativo e ISA."""
+
+        self.themes = {}            # Tema escuro (True) / claro (False), carregados sob demanda
+        self.get_theme(self.dark_mode)
+
+        try:
+            self.isa = load_isa("./configs/default_isa.json")   # ISA compilada (com cache por conteúdo)
+        except (OSError, ISAException) as e:
+            Tracing.event("config.error", path="./configs/default_isa.json", error=str(e))
+            self.isa = None
+
+    def get_theme(self, dark):
+        """Retorna um esquema de cores, lendo o arquivo apenas no primeiro uso."""
+        if dark not in self.themes:
+            self.themes[dark] = self.load_json_file(self.THEME_FILES[dark])
+        return self.themes[dark]
 
-        self.dark_theme = self.load_json_file("./configs/dark_theme.json")
-        self.light_theme = self.load_json_file("./configs/light_theme.json")
-        self.isa_config = self.load_json_file("./configs/default_isa.json")
+    @property
+    def dark_theme(self):
+        return self.get_theme(True)
 
-        self.load_isa()             # Carrega instruções e registradores da ISA
+    @property
+    def light_theme(self):
+        return self.get_theme(False)
 
     def load_json_file(self, file_path):
         """Carrega um arquivo JSON (configurações)."""
 
-        try:
-            with open(file_path, 'r') as file:
-                return json.load(file)
-        except Exception as e:
-            print(f"Failed to load {file_path}: {e}")
-            return {}
+        with Tracing.span("config.load", path=file_path) as trace:
+            try:
+                with open(file_path, 'r') as file:
+                    return json.load(file)
+            except Exception as e:
+                trace.set(error=str(e))
+                Tracing.event("config.error", path=file_path, error=str(e))
+                return {}
 
     def syntax_highlight_theme(self):
         """"Aplica as tags de destaque de sintaxe."""
@@ -136,44 +208,23 @@ class AssemblyEditor:
         file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
         if file_path:
             try:
-                with open(file_path, 'r') as file:
-                    self.isa_config = json.load(file)
-                    self.load_isa()
-                    self.highlight_syntax()
-            except Exception as e:
-                print(f"Failed to load ISA config: {e}")
-
-    def load_isa(self):
-        """Carrega as instruções e registradores da ISA."""
-        self.instructions = self.isa_config.get("instructions", {}).keys()
-        self.registers = self.isa_config.get("registers", {}).keys()
+                self.isa = load_isa(file_path)
+            except (OSError, ISAException) as e:
+                messagebox.showerror("Error", f"Failed to load ISA config: {e}")
+                return
+            self.highlighter.set_regex(self.token_regex)
+            self.schedule_diagnostics()
+
+    @property
+    def token_regex(self):
+        """Tokenizador do destaque de sintaxe da ISA carregada."""
+        if self.isa is None:
+            return build_token_regex((), ())
+        return self.isa.token_regex
 
     def highlight_syntax(self):
-        """Aplica o destaque de sintaxe."""
-        self.text_area.tag_remove("instruction", "1.0", tk.END)
-        self.text_area.tag_remove("register", "1.0", tk.END)
-        self.text_area.tag_remove("label", "1.0", tk.END)
-        self.text_area.tag_remove("comment", "1.0", tk.END)
-        self.text_area.tag_remove("number", "1.0", tk.END)
-
-        text = self.text_area.get("1.0", tk.END)
-
-        for instr in self.instructions:
-            for match in re.finditer(rf'\b{instr}\b', text):
-                self.text_area.tag_add("instruction", f"1.0+{match.start()}c", f"1.0+{match.end()}c")
-
-        for reg in self.registers:
-            for match in re.finditer(rf'\b{reg}\b', text):
-                self.text_area.tag_add("register", f"1.0+{match.start()}c", f"1.0+{match.end()}c")
-
-        for match in re.finditer(r'\b\d+\b', text):
-            self.text_area.tag_add("number", f"1.0+{match.start()}c", f"1.0+{match.end()}c")
-
-        for match in re.finditer(r'^\s*[A-Za-z_][A-Za-z0-9_]*:', text, re.MULTILINE):
-            self.text_area.tag_add("label", f"1.0+{match.start()}c", f"1.0+{match.end()}c")
-
-        for match in re.finditer(r';.*', text):
-            self.text_area.tag_add("comment", f"1.0+{match.start()}c", f"1.0+{match.end()}c")
+        """Aplica o destaque de sintaxe em todo o texto."""
+        self.highlighter.highlight_all()
 
     def bind_events(self):
         """Associa eventos à área de texto."""
@@ -192,38 +243,101 @@ class AssemblyEditor:
         self.text_area.bind("<Configure>", self.update_line_numbers)
         self.text_area.bind("<Control-v>", self.update_line_numbers)
         self.text_area.bind("<<Modified>>", self.on_text_modified)
+        # Antes de cada edição: linhas que ela pode substituir (destaque incremental)
+        for sequence in ("<KeyPress>", "<<Paste>>", "<<PasteSelection>>", "<<Cut>>", "<<Clear>>"):
+            self.text_area.bind(sequence, self.highlighter.before_edit, add="+")
+        for sequence in ("<<Undo>>", "<<Redo>>"):
+            self.text_area.bind(sequence, self.highlighter.before_undo, add="+")
 
     def on_text_modified(self, event):
         """Lida com eventos de modificação de texto."""
         if self.text_area.edit_modified():
             self.update_line_numbers()
-            self.highlight_syntax()
+            self.highlighter.on_edit()
+            self.schedule_diagnostics()
             self.text_area.edit_modified(False)
 
     def on_key_release(self, event):
-        """Atualiza o destaque de sintaxe e os números de linha."""
-        self.highlight_syntax()
+        """Atualiza o destaque de sintaxe das linhas editadas (agrupado com <<Modified>>)."""
+        self.highlighter.on_edit()
+
+    def schedule_diagnostics(self):
+        """Agenda o diagnóstico para quando a edição ficar ociosa."""
+        self.diagnostics_generation += 1    # O texto mudou: resultados em andamento ficam obsoletos
+        if self.diagnostics_after_id is not None:
+            self.root.after_cancel(self.diagnostics_after_id)
+            self.diagnostics_after_id = None
+        if self.loading or not self.live_diagnostics.get():
+            return      # Durante a carga, o diagnóstico roda uma vez ao final (ver poll_loader)
+        self.diagnostics_after_id = self.root.after(self.diagnostics_delay, self.request_diagnostics)
+
+    def request_diagnostics(self):
+        """Envia uma cópia do texto à thread de diagnóstico (a interface nunca espera)."""
+        self.diagnostics_after_id = None
+        if self.diagnostics_worker is None:
+            self.diagnostics_worker = DiagnosticsWorker()
+            self.diagnostics_worker.start()
+            self.poll_diagnostics()
+
+        self.diagnostics_worker.submit(self.diagnostics_generation, self.isa, self.text_area.get("1.0", "end-1c"))
+
+    def poll_diagnostics(self):
+        """Aplica os resultados da thread de diagnóstico que ainda correspondem ao texto atual."""
+        latest = None
+        while not self.diagnostics_worker.results.empty():
+            latest = self.diagnostics_worker.results.get_nowait()
+        if latest is not None and latest[0] == self.diagnostics_generation:
+            self.show_diagnostics(latest[1])
+        self.root.after(100, self.poll_diagnostics)
+
+    def show_diagnostics(self, diagnostics):
+        """Marca os trechos com problemas e atualiza a barra de status."""
+        for tag in (ERROR, WARNING):
+            self.text_area.tag_remove(tag, "1.0", tk.END)
+
+        for diagnostic in diagnostics:
+            end = f"{diagnostic.line}.end" if diagnostic.end is None else f"{diagnostic.line}.{diagnostic.end}"
+            self.text_area.tag_add(diagnostic.severity, f"{diagnostic.line}.{diagnostic.start}", end)
+
+        errors = sum(1 for diagnostic in diagnostics if diagnostic.severity == ERROR)
+        warnings = len(diagnostics) - errors
+        status = f"{errors} error(s), {warnings} warning(s)"
+        if diagnostics:
+            status += f"  |  {diagnostics[0]}"
+        self.status_bar.config(text=status)
+
+    def toggle_diagnostics(self):
+        """Liga/desliga o diagnóstico em segundo plano."""
+        if self.live_diagnostics.get():
+            self.request_diagnostics()
+        else:
+            self.diagnostics_generation += 1  # Descarta resultados em andamento
+            self.show_diagnostics([])
+            self.status_bar.config(text="")
 
     def update_line_numbers(self, event=None):
-        """Atualiza o painel de números de linha."""
-        # Salva a posição atual do scroll
-        current_scroll = self.text_area.yview()[0]
-
-        # Atualiza os números das linhas
-        self.line_numbers.config(state=tk.NORMAL)
-        self.line_numbers.delete("1.0", tk.END)
-
+        """Atualiza o painel de números de linha, acrescentando ou removendo apenas a diferença."""
         # Obtém o número correto de linhas usando o índice do text_area
         last_line_index = self.text_area.index("end-1c")
         total_lines = int(last_line_index.split(".")[0])
-        
-        line_numbers_str = "\n".join(str(i) for i in range(1, total_lines + 1))
-        self.line_numbers.insert("1.0", line_numbers_str)
-        self.line_numbers.config(state=tk.DISABLED)
 
-        # Restaura a posição do scroll sincronizando ambos os widgets
-        self.text_area.yview_moveto(current_scroll)
-        self.line_numbers.yview_moveto(current_scroll)
+        if total_lines == self.gutter_lines:
+            return
+
+        with Tracing.span("gutter", lines=total_lines, delta=total_lines - self.gutter_lines):
+            self.line_numbers.config(state=tk.NORMAL)
+            if total_lines > self.gutter_lines:
+                new_numbers = "\n".join(str(i) for i in range(self.gutter_lines + 1, total_lines + 1))
+                if self.gutter_lines:
+                    new_numbers = "\n" + new_numbers
+                self.line_numbers.insert("end-1c", new_numbers)
+            else:
+                self.line_numbers.delete(f"{total_lines}.end", "end-1c")
+            self.line_numbers.config(state=tk.DISABLED)
+            self.gutter_lines = total_lines
+
+        # Sincroniza o painel com a posição de rolagem do texto
+        self.line_numbers.yview_moveto(self.text_area.yview()[0])
 
     def on_scroll(self, event):
         """Sincroniza os números de linha com a rolagem do texto."""
@@ -248,6 +362,7 @@ class AssemblyEditor:
 
         file_menu = Menu(menu_bar, tearoff=0)
         file_menu.add_command(label="Open", command=self.open_file, accelerator="Ctrl+O")
+        file_menu.add_command(label="Open with Encoding...", command=self.open_file_with_encoding)
         file_menu.add_command(label="Save", command=self.save_file, accelerator="Ctrl+S")
         file_menu.add_command(label="Exit", command=self.root.quit)
         menu_bar.add_cascade(label="File", menu=file_menu)
@@ -259,14 +374,22 @@ class AssemblyEditor:
 
         assemble_menu = Menu(menu_bar, tearoff=0)
         assemble_menu.add_command(label="Assemble", command=self.assemble_code, accelerator="Ctrl+R")
+        assemble_menu.add_checkbutton(label="Peephole Optimization", variable=self.optimize)
+        assemble_menu.add_checkbutton(label="Live Diagnostics", variable=self.live_diagnostics, command=self.toggle_diagnostics)
         menu_bar.add_cascade(label="Assembler", menu=assemble_menu)
 
         about_menu = Menu(menu_bar, tearoff=0)
+        about_menu.add_command(label="Performance Stats", command=self.show_stats)
         about_menu.add_command(label="About", command=self.show_about_info)
         menu_bar.add_cascade(label="About", menu=about_menu)
 
         self.root.config(menu=menu_bar)
 
+    def show_stats(self):
+        """Abre o painel de estatísticas de desempenho (liga o rastreamento)."""
+        from StatsView import StatsView  # Carregado apenas quando usado
+        StatsView(self.root)
+
     def show_about_info(self):
         """Exibe informações sobre o software."""
 
@@ -297,6 +420,7 @@ class AssemblyEditor:
         line_color = theme_val.get('line_separator')
 
         self.text_area.config(background=bg, foreground=fg, insertbackground=fg)
+        self.status_bar.config(background=line_bg, foreground=line_fg)
         self.line_numbers.config(background=line_bg, foreground=line_fg)
         self.separator.config(bg=line_color)
         self.change_font_size(1)
@@ -307,23 +431,125 @@ class AssemblyEditor:
         self.dark_mode = not self.dark_mode
         self.update_theme()
 
-    def open_file(self):
+    def open_file(self, encoding=None):
+        """Abre um arquivo (codificação detectada, se não informada)."""
         file_path = filedialog.askopenfilename(filetypes=[("Assembly Files", "*.asm"), ("All Files", "*.*")])
         if file_path:
-            with open(file_path, "r") as file:
-                self.text_area.delete("1.0", tk.END)
-                self.text_area.insert("1.0", file.read())
-            self.highlight_syntax()
+            self.load_file(file_path, encoding)
+
+    def open_file_with_encoding(self):
+        encoding = simpledialog.askstring("Open with Encoding", "Encoding (ex.: latin-1, utf-8, cp1252):",
+                                          initialvalue=self.file_encoding, parent=self.root)
+        if not encoding:
+            return
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            messagebox.showerror("Error", f"Unknown encoding: {encoding}")
+            return
+        self.open_file(encoding)
+
+    def load_file(self, file_path, encoding=None):
+        """
+        Abre um arquivo sem bloquear a interface: a leitura e a decodificação
+        rodam em segundo plano e o texto é inserido em blocos, em chamadas
+        ociosas do Tk (a primeira tela aparece logo, o destaque acompanha cada bloco).
+        """
+        self.load_generation += 1
+        self.loading = True
+        loader = FileLoader(file_path, encoding)
+        loader.start()
+
+        self.status_bar.config(text=f"Opening {file_path}...")
+        self.poll_loader(loader, self.load_generation)
+
+    def poll_loader(self, loader, generation):
+        """Insere no máximo um bloco por chamada, devolvendo o controle ao laço do Tk entre blocos."""
+        if generation != self.load_generation:
+            loader.cancel()     # Outro arquivo foi aberto
+            return
+
+        try:
+            event = loader.events.get_nowait()
+        except queue.Empty:
+            self.root.after(20, self.poll_loader, loader, generation)
+            return
+
+        if event[0] == "opened":
+            self.loading_info = event[1:]     # (codificação, quebra de linha, linhas)
+            # Arquivo lido e decodificado: só agora o texto atual é substituído
+            self.text_area.config(state=tk.NORMAL)
+            self.text_area.delete("1.0", tk.END)
+            self.text_area.config(state=tk.DISABLED)   # Sem edição até o fim da carga
+        elif event[0] == "chunk":
+            first = int(self.text_area.index("end-1c").split(".")[0])
+            self.text_area.config(state=tk.NORMAL)
+            self.text_area.insert("end-1c", event[1])
+            self.text_area.config(state=tk.DISABLED)
+            self.highlighter.mark_dirty(first, self.highlighter.total_lines())
+            self.highlighter.schedule()     # Destaque agrupado, fora do laço de carga
             self.update_line_numbers()
-            self.change_font_size(1)
-            self.change_font_size(-1)
+        elif event[0] == "done":
+            self.loading = False
+            self.file_path = loader.path
+            self.file_encoding, self.file_newline, line_count = self.loading_info
+            self.text_area.config(state=tk.NORMAL)
+            self.text_area.edit_reset()         # A carga não entra no histórico de desfazer
+            self.text_area.mark_set("insert", "1.0")
+            self.highlighter.line_count = self.highlighter.total_lines()
+            self.status_bar.config(text=f"{loader.path}  |  {self.file_encoding}, {line_count} lines")
+            self.schedule_diagnostics()         # Uma única vez, com o texto completo
+            return
+        elif event[0] == "error":
+            self.loading = False    # Falha antes de "opened": texto e arquivo atuais intactos
+            self.status_bar.config(text="")
+            messagebox.showerror("Error", f"Failed to open {loader.path}: {event[1]}")
+            return
+
+        self.root.after_idle(self.poll_loader, loader, generation)
 
     def save_file(self):
+        """Salva de forma atômica em segundo plano, mantendo a codificação e as quebras de linha do arquivo."""
+        if self.loading:
+            self.status_bar.config(text="Wait until the file finishes opening")
+            return
         file_path = filedialog.asksaveasfilename(defaultextension=".asm", filetypes=[("Assembly Files", "*.asm"), ("All Files", "*.*")])
-        if file_path:
-            with open(file_path, "w") as file:
-                file.write(self.text_area.get("1.0", tk.END))
+        if not file_path:
+            return
+        if self.file_saver is None:
+            self.file_saver = FileSaver()
+            self.file_saver.start()
+        self.file_saver.submit(file_path, self.text_area.get("1.0", "end-1c"), self.file_encoding, self.file_newline)
+        self.status_bar.config(text=f"Saving {file_path}...")
+        self.pending_saves += 1
+        if self.pending_saves == 1:
+            self.root.after(50, self.poll_saver)
+
+    def poll_saver(self):
+        """Aplica os resultados das gravações concluídas."""
+        try:
+            while True:
+                result = self.file_saver.results.get_nowait()
+                self.pending_saves -= 1
+                if result[0] == "saved":
+                    self.file_path = result[1]
+                    self.status_bar.config(text=f"Saved {result[1]}  |  {self.file_encoding}, {result[2]} bytes")
+                else:
+                    self.status_bar.config(text="")
+                    messagebox.showerror("Error", f"Failed to save {result[1]}: {result[2]}")
+        except queue.Empty:
+            pass
+        if self.pending_saves:
+            self.root.after(50, self.poll_saver)
 
     def assemble_code(self):
         """Este método chama o Assembler e exibe o código de máquina."""
-        Assembler(self.root, self.text_area, self.isa_config, self.dark_theme)
+        if self.loading:
+            self.status_bar.config(text="Wait until the file finishes opening")
+            return
+        if self.assembler is None:
+            self.assembler = Assembler(self.root, self.text_area, self.isa, self.dark_theme, self.file_path)
+        self.assembler.isa_config = self.isa    # A ISA pode ter sido trocada
+        self.assembler.file_path = self.file_path
+        self.assembler.optimize = self.optimize.get()
+        self.assembler.assemble_code()
@@ -0,0 +1,16 @@
+import tkinter as tk
+
+# Imagens já decodificadas (caminho -> PhotoImage), compartilhadas por todas as janelas
+_images = {}
+
+def load_image(path):
+    """Decodifica uma imagem (ícones) apenas uma vez por processo."""
+    image = _images.get(path)
+    if image is None:
+        try:
+            image = tk.PhotoImage(file=path)    # PNG/GIF: decodificador nativo do Tk 8.6
+        except tk.TclError:
+            from PIL import Image, ImageTk      # Demais formatos: PIL, importado só quando necessário
+            image = ImageTk.PhotoImage(Image.open(path))
+        _images[path] = image
+    return image
@@ -0,0 +1,214 @@
+import os
+import time
+from AssemblerCore import AssemblerCore
+from ISACompiler import CompiledISA, compile_isa
+from ProgramImage import ProgramImage
+
+DEFAULT_ISA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "configs", "default_isa.json")
+
+# Códigos semânticos das instruções da BIP-I (independentes dos opcodes da ISA carregada)
+HLT, STO, LD, LDI, ADD, ADDI, SUB, SUBI, JUMP, NOP, CMP, JNE, JL, JG, IN, OUT = range(16)
+
+SEMANTICS = {
+    "HLT": HLT, "STO": STO, "LD": LD, "LDI": LDI,
+    "ADD": ADD, "ADDI": ADDI, "SUB": SUB, "SUBI": SUBI,
+    "JUMP": JUMP, "NOP": NOP, "CMP": CMP, "JNE": JNE,
+    "JL": JL, "JG": JG, "IN": IN, "OUT": OUT,
+}
+
+class SimulationResult:
+    """
+    Resultado de uma execução: motivo da parada e contadores.
+    """
+    HALTED = "halted"       # Executou HLT
+    LIMIT = "limit"         # Atingiu o limite de instruções
+    TIMEOUT = "timeout"     # Atingiu o tempo limite
+
+    def __init__(self, reason, instructions, seconds):
+        self.reason = reason
+        self.instructions = instructions
+        self.seconds = seconds
+
+    @property
+    def halted(self):
+        return self.reason == self.HALTED
+
+    @property
+    def ips(self):
+        """Instruções por segundo."""
+        return self.instructions / self.seconds if self.seconds > 0 else 0.0
+
+    def __repr__(self):
+        return f"SimulationResult({self.reason}, {self.instructions} instr, {self.ips:,.0f} instr/s)"
+
+class BIPSimulator:
+    """
+    Simulador da CPU BIP-I (ACC, flag de CMP, PC, memória de dados e portas IN/OUT).
+
+    Cada palavra do programa é pré-decodificada uma única vez em duas listas
+    (código semântico e operando), de modo que o laço de execução nunca
+    reinterpreta instruções. Por padrão as memórias de programa e de dados
+    são separadas (arquitetura Harvard), com 4096 palavras de 16 bits cada;
+    com unified_memory=True há uma única memória e um STO sobre o código
+    altera o programa (código automodificável).
+    """
+
+    MEMORY_SIZE = 2**12
+    SLICE = 2**16  # Instruções executadas entre verificações de tempo limite
+
+    def __init__(self, program, isa_config=None, inputs=None, record_outputs=True, unified_memory=False):
+        """
+        :param program: ProgramImage ou sequência de palavras de 16 bits
+        :param isa_config: Configuração da ISA (padrão: configs/default_isa.json)
+        :param inputs: Valores das portas de entrada (dict porta -> valor, ou lista);
+                       portas não informadas são lidas como 0
+        :param record_outputs: Registra cada escrita OUT em output_log
+        :param unified_memory: Programa e dados compartilham a mesma memória
+        """
+        if isa_config is None:
+            isa_config = AssemblerCore.load_isa(DEFAULT_ISA)
+
+        self.opcode_semantics = self.build_opcode_table(isa_config)
+        self.words = list(program.words if isinstance(program, ProgramImage) else program)
+        if len(self.words) > self.MEMORY_SIZE:
+            raise ValueError(f"Programa com {len(self.words)} palavras excede a memória de {self.MEMORY_SIZE}!")
+
+        self.unified_memory = unified_memory
+        if inputs is None:
+            inputs = {}
+        elif not hasattr(inputs, "get"):
+            inputs = dict(enumerate(inputs))    # Lista: porta i -> inputs[i]
+        self.inputs = inputs
+        self.output_log = [] if record_outputs else None
+        self.reset()
+
+    @staticmethod
+    def build_opcode_table(isa_config):
+        """Mapeia cada opcode (0-15) da ISA carregada para o código semântico da BIP-I."""
+        isa = isa_config if isinstance(isa_config, CompiledISA) else compile_isa(isa_config)
+        table = [NOP] * 16
+        for name, opcode in isa.opcodes.items():
+            if name not in SEMANTICS:
+                raise ValueError(f"Instrução {name} não é suportada pelo simulador da BIP-I")
+            table[opcode] = SEMANTICS[name]
+        return table
+
+    @classmethod
+    def predecode(cls, words, semantics):
+        """Decodifica as palavras em listas de código semântico e operando."""
+        # A memória de programa fora da imagem é zerada (palavra 0); a última posição extra
+        # é um HLT sentinela para o caso de o PC ultrapassar o fim da memória
+        padded = list(words) + [0] * (cls.MEMORY_SIZE - len(words))
+        ops = [semantics[word >> 12] for word in padded] + [HLT]
+        args = [word & 0xFFF for word in padded] + [0]
+        return ops, args
+
+    def reset(self):
+        """Reinicia registradores, memória de dados e portas de saída."""
+        self.acc = 0
+        self.pc = 0
+        self.flag = 0       # Resultado do último CMP: 0 (igual), -1 (mem < ACC), 1 (mem > ACC)
+        self.ops, self.args = self.predecode(self.words, self.opcode_semantics)
+        if self.unified_memory:
+            self.memory = self.words + [0] * (self.MEMORY_SIZE - len(self.words))
+        else:
+            self.memory = [0] * self.MEMORY_SIZE
+        self.outputs = {}
+        self.halted = False
+        self.instructions = 0
+        self.watched = None     # Opcional: contador por endereço; STOs em endereços vigiados vão para dirty
+        self.dirty = []
+        if self.output_log is not None:
+            self.output_log.clear()
+
+    def run(self, max_instructions=None, timeout=None):
+        """
+        Executa até HLT, até max_instructions instruções ou até timeout segundos.
+
+        :return: SimulationResult
+        """
+        start = time.perf_counter()
+        deadline = start + timeout if timeout is not None else None
+        executed = 0
+        reason = SimulationResult.HALTED
+
+        while not self.halted:
+            budget = self.SLICE
+            if max_instructions is not None:
+                budget = min(budget, max_instructions - executed)
+                if budget <= 0:
+                    reason = SimulationResult.LIMIT
+                    break
+
+            executed += self.execute(budget)
+
+            if deadline is not None and not self.halted and time.perf_counter() >= deadline:
+                reason = SimulationResult.TIMEOUT
+                break
+
+        return SimulationResult(reason, executed, time.perf_counter() - start)
+
+    def execute(self, budget):
+        """Executa no máximo budget instruções; retorna quantas foram executadas."""
+        ops, args, memory = self.ops, self.args, self.memory
+        inputs, outputs, output_log = self.inputs, self.outputs, self.output_log
+        unified, semantics = self.unified_memory, self.opcode_semantics
+        watched, dirty = self.watched, self.dirty
+        acc, pc, flag = self.acc, self.pc, self.flag
+        executed = budget
+
+        # Códigos semânticos como literais (mais rápido que consultar globais no laço)
+        for count in range(budget):
+            op = ops[pc]
+            arg = args[pc]
+            pc += 1
+
+            if op == 4:      # ADD
+                acc = (acc + memory[arg]) & 0xFFFF
+            elif op == 2:    # LD
+                acc = memory[arg]
+            elif op == 1:    # STO
+                memory[arg] = acc
+                if unified:  # Re-decodifica a palavra alterada
+                    ops[arg] = semantics[acc >> 12]
+                    args[arg] = acc & 0xFFF
+                    if watched is not None and watched[arg]:
+                        dirty.append(arg)
+            elif op == 5:    # ADDI
+                acc = (acc + arg) & 0xFFFF
+            elif op == 10:   # CMP
+                value = memory[arg]
+                flag = 0 if value == acc else (-1 if value < acc else 1)
+            elif op == 11:   # JNE
+                if flag:
+                    pc = arg
+            elif op == 3:    # LDI
+                acc = arg
+            elif op == 8:    # JUMP
+                pc = arg
+            elif op == 7:    # SUBI
+                acc = (acc - arg) & 0xFFFF
+            elif op == 6:    # SUB
+                acc = (acc - memory[arg]) & 0xFFFF
+            elif op == 15:   # OUT
+                outputs[arg] = acc
+                if output_log is not None:
+                    output_log.append((arg, acc))
+            elif op == 12:   # JL
+                if flag < 0:
+                    pc = arg
+            elif op == 13:   # JG
+                if flag > 0:
+                    pc = arg
+            elif op == 14:   # IN
+                acc = inputs.get(arg, 0) & 0xFFFF
+            elif op == 0:    # HLT
+                pc -= 1
+                self.halted = True
+                executed = count + 1
+                break
+            # NOP: nada a fazer
+
+        self.acc, self.pc, self.flag = acc, pc, flag
+        self.instructions += executed
+        return executed
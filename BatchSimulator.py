@@ -0,0 +1,150 @@
+import time
+import numpy as np
+from AssemblerCore import AssemblerCore
+from BIPSimulator import (
+    BIPSimulator, DEFAULT_ISA,
+    HLT, STO, LD, LDI, ADD, ADDI, SUB, SUBI, JUMP, CMP, JNE, JL, JG, IN, OUT,
+)
+from ProgramImage import ProgramImage
+
+# Instruções cujo operando é um endereço da memória de dados
+MEMORY_OPS = (STO, LD, ADD, SUB, CMP)
+
+class BatchResult:
+    """
+    Resultado de uma execução em lote (uma linha por vetor de entrada).
+    """
+    def __init__(self, outputs, written, halted, instructions, steps, seconds):
+        self.outputs = outputs              # (N, portas OUT): último valor escrito em cada porta
+        self.written = written              # (N, portas OUT): a porta recebeu algum OUT
+        self.halted = halted                # (N,): a linha executou HLT
+        self.instructions = instructions    # (N,): instruções executadas por linha
+        self.steps = steps                  # Passos do laço em conjunto
+        self.seconds = seconds
+
+    def __repr__(self):
+        return (f"BatchResult({len(self.halted)} linhas, {int(self.halted.sum())} com HLT, "
+                f"{self.steps} passos, {self.seconds:.3f} s)")
+
+class BatchSimulator:
+    """
+    Executa um único programa da BIP-I sobre milhares de vetores de entrada
+    ao mesmo tempo. ACC, PC, flag de CMP e memória de dados são arrays NumPy
+    com uma linha por vetor; todas as linhas avançam juntas e os desvios
+    divergentes viram atualizações mascaradas.
+    """
+
+    def __init__(self, program, isa_config=None):
+        """
+        :param program: ProgramImage ou sequência de palavras de 16 bits
+        :param isa_config: Configuração da ISA (padrão: configs/default_isa.json)
+        """
+        if isa_config is None:
+            isa_config = AssemblerCore.load_isa(DEFAULT_ISA)
+
+        words = list(program.words if isinstance(program, ProgramImage) else program)
+        semantics = BIPSimulator.build_opcode_table(isa_config)
+        ops, args = BIPSimulator.predecode(words, semantics)
+        self.ops = np.array(ops, dtype=np.int8)
+        self.args = np.array(args, dtype=np.int64)
+
+        # Dimensiona memória e portas apenas até o maior endereço usado pelo programa
+        code = self.ops[:len(words)]
+        operands = self.args[:len(words)]
+
+        def columns(selected):
+            used = operands[np.isin(code, selected)]
+            return int(used.max()) + 1 if used.size else 1
+
+        self.memory_columns = columns(MEMORY_OPS)
+        self.input_columns = columns((IN,))
+        self.output_columns = columns((OUT,))
+
+    def run(self, inputs, max_steps=1_000_000, timeout=None):
+        """
+        Executa o programa para cada linha de inputs.
+
+        :param inputs: Array (N, portas IN) ou (N,) com os valores das portas de entrada
+        :param max_steps: Limite de instruções por linha
+        :param timeout: Tempo limite (s) para o lote inteiro
+        :return: BatchResult
+        """
+        inputs = np.asarray(inputs, dtype=np.int64)
+        if inputs.ndim == 1:
+            inputs = inputs[:, None]
+        if inputs.shape[1] < self.input_columns:
+            # Portas IN não informadas leem 0, como nos simuladores escalares
+            inputs = np.pad(inputs, ((0, 0), (0, self.input_columns - inputs.shape[1])))
+        inputs = inputs & 0xFFFF
+
+        rows = inputs.shape[0]
+        acc = np.zeros(rows, dtype=np.int64)
+        pc = np.zeros(rows, dtype=np.int64)
+        flag = np.zeros(rows, dtype=np.int64)
+        memory = np.zeros((rows, self.memory_columns), dtype=np.int64)
+        outputs = np.zeros((rows, self.output_columns), dtype=np.int64)
+        written = np.zeros((rows, self.output_columns), dtype=bool)
+        halted = np.zeros(rows, dtype=bool)
+        instructions = np.zeros(rows, dtype=np.int64)
+
+        start = time.perf_counter()
+        deadline = start + timeout if timeout is not None else None
+        active = np.arange(rows)
+        steps = 0
+
+        while active.size and steps < max_steps:
+            current = pc[active]
+            op = self.ops[current]
+            arg = self.args[current]
+            pc[active] = current + 1
+            instructions[active] += 1
+
+            if (op == op[0]).all():
+                groups = ((int(op[0]), active, arg),)  # Sem divergência: uma única atualização
+            else:
+                groups = []
+                for code in np.unique(op):
+                    selected = op == code
+                    groups.append((int(code), active[selected], arg[selected]))
+
+            for code, index, operand in groups:
+                if code == LD:
+                    acc[index] = memory[index, operand]
+                elif code == STO:
+                    memory[index, operand] = acc[index]
+                elif code == LDI:
+                    acc[index] = operand
+                elif code == ADD:
+                    acc[index] = (acc[index] + memory[index, operand]) & 0xFFFF
+                elif code == ADDI:
+                    acc[index] = (acc[index] + operand) & 0xFFFF
+                elif code == SUB:
+                    acc[index] = (acc[index] - memory[index, operand]) & 0xFFFF
+                elif code == SUBI:
+                    acc[index] = (acc[index] - operand) & 0xFFFF
+                elif code == CMP:
+                    flag[index] = np.sign(memory[index, operand] - acc[index])
+                elif code == JUMP:
+                    pc[index] = operand
+                elif code in (JNE, JL, JG):
+                    value = flag[index]
+                    taken = value != 0 if code == JNE else (value < 0 if code == JL else value > 0)
+                    pc[index[taken]] = operand[taken]
+                elif code == IN:
+                    acc[index] = inputs[index, operand]
+                elif code == OUT:
+                    outputs[index, operand] = acc[index]
+                    written[index, operand] = True
+                elif code == HLT:
+                    pc[index] -= 1
+                    halted[index] = True
+                # NOP: nada a fazer
+
+            if halted[active].any():
+                active = active[~halted[active]]
+
+            steps += 1
+            if deadline is not None and steps % 1024 == 0 and time.perf_counter() >= deadline:
+                break
+
+        return BatchResult(outputs, written, halted, instructions, steps, time.perf_counter() - start)
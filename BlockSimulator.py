@@ -0,0 +1,166 @@
+from BIPSimulator import (
+    BIPSimulator,
+    HLT, STO, LD, LDI, ADD, ADDI, SUB, SUBI, JUMP, CMP, JNE, JL, JG, IN, OUT,
+)
+
+BRANCHES = (JUMP, JNE, JL, JG)
+
+class BlockSimulator(BIPSimulator):
+    """
+    Simulador da BIP-I com cache de tradução de blocos básicos.
+
+    O programa é dividido em blocos básicos (nos alvos de desvio e após
+    JUMP/JNE/JL/JG/HLT). Na primeira execução, cada bloco é traduzido para
+    uma função Python compilada e guardado no cache pelo endereço inicial;
+    as execuções seguintes chamam a função diretamente. Com memória
+    unificada, um STO sobre um endereço de código invalida os blocos afetados.
+    """
+
+    MAX_BLOCK = 256  # Tamanho máximo de um bloco traduzido
+
+    def reset(self):
+        super().reset()
+        self.blocks = {}                            # Endereço inicial -> (função, tamanho)
+        self.covered = [0] * (self.MEMORY_SIZE + 1)  # Quantos blocos em cache cobrem cada endereço
+        self.watched = self.covered                 # STOs interpretados também marcam código alterado
+        self.translations = 0
+        self.invalidations = 0
+        self.leaders = self.find_leaders()
+
+    def find_leaders(self):
+        """Endereços que iniciam blocos básicos: alvos de desvio e instruções após desvios."""
+        leaders = {0}
+        for address in range(len(self.words)):
+            op = self.ops[address]
+            if op in BRANCHES:
+                leaders.add(self.args[address])
+            if op in BRANCHES or op == HLT:
+                leaders.add(address + 1)
+        return leaders
+
+    def translate(self, start):
+        """Traduz o bloco básico iniciado em start para uma função Python."""
+        ops, args = self.ops, self.args
+        unified = self.unified_memory
+        lines = []
+        address = start
+        count = 0
+
+        def emit(code):
+            lines.append("        " + code)
+
+        while True:
+            op, arg = ops[address], args[address]
+            count += 1
+            following = address + 1
+
+            if op == LD:
+                emit(f"acc = memory[{arg}]")
+            elif op == STO:
+                emit(f"memory[{arg}] = acc")
+                if unified:
+                    emit(f"ops[{arg}] = semantics[acc >> 12]; args[{arg}] = acc & 0xFFF")
+                    emit(f"if covered[{arg}]:")
+                    emit(f"    dirty.append({arg})")
+                    emit(f"    return acc, flag, {following}, {count}, False")
+            elif op == LDI:
+                emit(f"acc = {arg}")
+            elif op == ADD:
+                emit(f"acc = (acc + memory[{arg}]) & 0xFFFF")
+            elif op == ADDI:
+                emit(f"acc = (acc + {arg}) & 0xFFFF")
+            elif op == SUB:
+                emit(f"acc = (acc - memory[{arg}]) & 0xFFFF")
+            elif op == SUBI:
+                emit(f"acc = (acc - {arg}) & 0xFFFF")
+            elif op == CMP:
+                emit(f"value = memory[{arg}]")
+                emit("flag = 0 if value == acc else (-1 if value < acc else 1)")
+            elif op == IN:
+                emit(f"acc = inputs.get({arg}, 0) & 0xFFFF")
+            elif op == OUT:
+                emit(f"outputs[{arg}] = acc")
+                if self.output_log is not None:
+                    emit(f"output_log.append(({arg}, acc))")
+            elif op == JUMP:
+                emit(f"return acc, flag, {arg}, {count}, False")
+                break
+            elif op in (JNE, JL, JG):
+                condition = {JNE: "flag", JL: "flag < 0", JG: "flag > 0"}[op]
+                emit(f"if {condition}:")
+                emit(f"    return acc, flag, {arg}, {count}, False")
+                emit(f"return acc, flag, {following}, {count}, False")
+                break
+            elif op == HLT:
+                emit(f"return acc, flag, {address}, {count}, True")
+                break
+            # NOP: nenhuma instrução gerada
+
+            address = following
+            if address in self.leaders or count >= self.MAX_BLOCK or address >= self.MEMORY_SIZE:
+                emit(f"return acc, flag, {address}, {count}, False")
+                break
+
+        source = "def make(memory, inputs, outputs, output_log, ops, args, semantics, covered, dirty):\n"
+        source += "    def block(acc, flag):\n" + "\n".join(lines) + "\n    return block\n"
+        namespace = {}
+        exec(compile(source, f"<bloco {start}>", "exec"), namespace)
+        function = namespace["make"](
+            self.memory, self.inputs, self.outputs, self.output_log,
+            self.ops, self.args, self.opcode_semantics, self.covered, self.dirty,
+        )
+
+        for covered_address in range(start, address + 1):
+            self.covered[covered_address] += 1
+
+        self.blocks[start] = entry = (function, count, address)
+        self.translations += 1
+        return entry
+
+    def invalidate(self, address):
+        """Descarta os blocos em cache que contêm o endereço alterado."""
+        for start, (_, _, end) in list(self.blocks.items()):
+            if start <= address <= end:
+                del self.blocks[start]
+                for covered_address in range(start, end + 1):
+                    self.covered[covered_address] -= 1
+                self.invalidations += 1
+
+    def invalidate_dirty(self):
+        for address in self.dirty:
+            self.invalidate(address)
+        self.dirty.clear()
+
+    def execute(self, budget):
+        """Executa blocos em cache; o restante do orçamento que não cabe em um bloco é interpretado."""
+        blocks, dirty = self.blocks, self.dirty
+        acc, pc, flag = self.acc, self.pc, self.flag
+        executed = 0
+        halted = False
+
+        while True:
+            entry = blocks.get(pc)
+            if entry is None:
+                entry = self.translate(pc)
+            function, length, _ = entry
+
+            if executed + length > budget:
+                break  # O bloco não cabe no orçamento: completa instrução a instrução
+
+            acc, flag, pc, count, halted = function(acc, flag)
+            executed += count
+
+            if dirty:
+                self.invalidate_dirty()
+            if halted:
+                break
+
+        self.acc, self.pc, self.flag = acc, pc, flag
+        self.instructions += executed
+        if halted:
+            self.halted = True
+            return executed
+        if executed < budget:
+            executed += super().execute(budget - executed)
+            self.invalidate_dirty()
+        return executed
@@ -0,0 +1,130 @@
+import queue
+import threading
+import Tracing
+from AssemblerCore import strip_comments
+
+ERROR = "error"
+WARNING = "warning"
+
+class Diagnostic:
+    """
+    Problema encontrado no código-fonte, com a posição (linha, colunas) do trecho.
+    """
+    def __init__(self, severity, message, line, start=0, end=None):
+        self.severity = severity    # ERROR ou WARNING
+        self.message = message
+        self.line = line            # Linha do código-fonte (a partir de 1)
+        self.start = start          # Coluna inicial do trecho
+        self.end = end              # Coluna final (None: até o fim da linha)
+
+    def __str__(self):
+        return f"{self.severity.upper()} LINE {self.line}: {self.message}"
+
+def span(raw_line, token, start=0):
+    """Colunas (início, fim) de um token na linha original."""
+    column = raw_line.find(token, start)
+    if column < 0:
+        return 0, None
+    return column, column + len(token)
+
+def diagnose(isa, source):
+    """
+    Verifica o código-fonte sem montá-lo, reunindo todos os problemas:
+    instrução desconhecida, operando ausente, rótulo indefinido, rótulo
+    duplicado e operando maior que 12 bits.
+
+    :param isa: CompiledISA em uso (None: nenhuma verificação)
+    :param source: Código Assembly (string)
+    :return: Lista de Diagnostic, ordenada por linha
+    """
+    if isa is None:
+        return []
+
+    raw_lines = source.split("\n")
+    diagnostics = []
+    labels = {}                 # Rótulo -> linha da primeira definição
+    externs = set()             # Símbolos declarados com .extern
+    instructions = []
+
+    # Primeira passagem: rótulos (as referências podem vir antes da definição)
+    for line_number, line in strip_comments(raw_lines):
+        if line.startswith(".extern"):
+            # Símbolos de outros arquivos: resolvidos pelo ligador
+            externs.update(line[len(".extern"):].replace(",", " ").split())
+        elif line.startswith("."):
+            continue  # Demais diretivas (.include) são verificadas na ligação
+        elif ":" in line:  # Definição de rótulo
+            label = line.split(":")[0].strip()
+            if label in labels:
+                start, end = span(raw_lines[line_number - 1], label)
+                diagnostics.append(Diagnostic(
+                    WARNING, f"Duplicate label {label} (first defined at line {labels[label]})", line_number, start, end))
+            else:
+                labels[label] = line_number
+        else:
+            instructions.append((line_number, line.split()))
+
+    # Segunda passagem: instruções e operandos
+    for line_number, parts in instructions:
+        raw_line = raw_lines[line_number - 1]
+        instr = parts[0]
+        instr_start, instr_end = span(raw_line, instr)
+
+        encoding = isa.encoding.get(instr)
+        if encoding is None:
+            diagnostics.append(Diagnostic(ERROR, f"Invalid instruction {instr}", line_number, instr_start, instr_end))
+            continue
+        if not encoding[1]:  # Sem operando
+            continue
+
+        if len(parts) < 2:
+            diagnostics.append(Diagnostic(ERROR, f"Missing operand for {instr}", line_number, instr_start, instr_end))
+            continue
+
+        operand = parts[1]
+        start, end = span(raw_line, operand, instr_end or 0)
+        if operand in isa.registers:
+            continue
+        elif operand.isdigit():
+            if int(operand) >= 2**12:
+                diagnostics.append(Diagnostic(ERROR, f"Operand {operand} out of 12-bit range", line_number, start, end))
+        elif operand not in labels and operand not in externs:
+            diagnostics.append(Diagnostic(ERROR, f"Undefined label {operand}", line_number, start, end))
+
+    diagnostics.sort(key=lambda diagnostic: diagnostic.line)
+    return diagnostics
+
+class DiagnosticsWorker(threading.Thread):
+    """
+    Thread de diagnóstico em segundo plano.
+
+    Recebe cópias do texto (com um número de geração) e devolve os diagnósticos
+    em uma fila. Pedidos acumulados são descartados em favor do mais recente.
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.requests = queue.Queue()
+        self.results = queue.Queue()    # (geração, lista de Diagnostic)
+
+    def submit(self, generation, isa, source):
+        self.requests.put((generation, isa, source))
+
+    def run(self):
+        while True:
+            request = self.requests.get()
+            # Somente o pedido mais recente interessa
+            while True:
+                try:
+                    request = self.requests.get_nowait()
+                except queue.Empty:
+                    break
+
+            generation, isa, source = request
+            try:
+                with Tracing.span("diagnostics") as trace:
+                    diagnostics = diagnose(isa, source)
+                    trace.set(found=len(diagnostics))
+            except Exception as e:
+                diagnostics = [Diagnostic(ERROR, f"Diagnostics failed: {e}", 1)]
+            self.results.put((generation, diagnostics))
@@ -0,0 +1,68 @@
+import tkinter as tk
+
+class EditTracker:
+    """
+    Registra o trecho de linhas alterado em um tk.Text desde a última consulta.
+
+    O comando Tcl do widget é renomeado e substituído por dispatch(), que
+    intercepta insert/delete/replace (inclusive os de desfazer/refazer, que o
+    Tk executa pelo mesmo comando) e acumula o trecho alterado. Assim o
+    montador recebe apenas as linhas editadas, sem comparar o texto inteiro.
+    """
+
+    EDITS = ("insert", "delete", "replace")
+
+    def __init__(self, text_area):
+        self.text_area = text_area
+        self.changed = None     # (primeira, última antes das edições, última atual), a partir de 1
+        self.original = text_area._w + "_original"
+        text_area.tk.call("rename", text_area._w, self.original)
+        text_area.tk.createcommand(text_area._w, self.dispatch)
+
+    def call(self, *args):
+        return self.text_area.tk.call((self.original,) + args)
+
+    def line_count(self):
+        return int(self.call("index", "end-1c").split(".")[0])
+
+    def line_of(self, index):
+        return int(self.call("index", index).split(".")[0])
+
+    def dispatch(self, command, *args):
+        """Executa o comando original do widget, registrando as linhas que ele altera."""
+        try:
+            if command not in self.EDITS or not args:
+                return self.call(command, *args)
+
+            before = self.line_count()
+            if command == "insert":
+                lines = [self.line_of(args[0])]
+            elif command == "delete" and len(args) == 1:
+                lines = [self.line_of(args[0]), self.line_of(f"{args[0]} +1c")]   # Pode remover a quebra de linha
+            else:
+                indices = args if command == "delete" else args[:2]
+                lines = [self.line_of(index) for index in indices]
+
+            lines = [min(line, before) for line in lines]     # "end" fica após a última linha
+            result = self.call(command, *args)
+            self.record(min(lines), max(lines), self.line_count() - before)
+            return result
+        except tk.TclError:
+            # Um erro não pode atravessar o comando Python (seria relançado no mainloop); como
+            # no IDLE, índices inválidos (ex.: sel.first sem seleção) apenas não alteram o texto
+            return ""
+
+    def record(self, first, last, delta):
+        """Acumula a edição das linhas [first, last], que passaram a ser [first, last + delta]."""
+        if self.changed is None:
+            self.changed = (first, last, last + delta)
+            return
+        changed_first, old_last, new_last = self.changed
+        # Linhas após o trecho acumulado estão deslocadas de new_last - old_last em relação ao texto anterior
+        old_last = max(old_last, last - (new_last - old_last))
+        self.changed = (min(changed_first, first), old_last, max(new_last, last) + delta)
+
+    def take(self):
+        """Retorna e limpa o trecho alterado: (primeira, última anterior, última atual) ou None."""
+        changed, self.changed = self.changed, None
+        return changed
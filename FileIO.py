@@ -0,0 +1,136 @@
+import codecs
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import Tracing
+
+FIRST_CHUNK_LINES = 200     # Primeira tela: exibida assim que o arquivo é lido
+CHUNK_LINES = 2000          # Demais blocos, inseridos em chamadas ociosas do Tk
+
+def decode(raw, encoding=None):
+    """
+    Decodifica o conteúdo de um arquivo.
+
+    Sem codificação informada: UTF-8 (com ou sem BOM) e, se inválido,
+    Latin-1 (que aceita qualquer sequência de bytes, como os examples/).
+
+    :return: (texto com quebras de linha \\n, codificação, quebra de linha original)
+    :raises UnicodeDecodeError: se o conteúdo não é válido na codificação informada
+    :raises LookupError: codificação desconhecida
+    """
+    if encoding is None:
+        if raw.startswith(codecs.BOM_UTF8):
+            encoding = "utf-8-sig"
+        else:
+            try:
+                raw.decode("utf-8")
+                encoding = "utf-8"
+            except UnicodeDecodeError:
+                encoding = "latin-1"
+
+    text = raw.decode(encoding)
+    newline = "\r\n" if "\r\n" in text else "\n"
+    return text.replace("\r\n", "\n"), encoding, newline
+
+def split_chunks(text, first_lines=FIRST_CHUNK_LINES, chunk_lines=CHUNK_LINES):
+    """Divide o texto em blocos de linhas cuja concatenação reproduz o texto."""
+    lines = text.split("\n")
+    start, size = 0, first_lines
+    while start < len(lines):
+        end = min(start + size, len(lines))
+        yield "\n".join(lines[start:end]) + ("\n" if end < len(lines) else "")
+        start, size = end, chunk_lines
+
+def atomic_write(path, text, encoding="utf-8", newline="\n"):
+    """
+    Grava o texto de forma atômica: arquivo temporário no mesmo diretório,
+    fsync e os.replace. Em caso de erro, o arquivo original fica intacto.
+
+    :raises UnicodeEncodeError: texto não representável na codificação
+    :raises OSError: falha de gravação
+    """
+    data = text.replace("\n", newline).encode(encoding)    # Antes de tocar no disco
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)    # mkstemp cria o arquivo com permissão 0600
+        else:
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return len(data)
+
+class FileLoader(threading.Thread):
+    """
+    Leitura e decodificação de um arquivo em segundo plano.
+
+    Publica na fila de eventos:
+    ("opened", codificação, quebra de linha, linhas), ("chunk", texto)..., ("done",)
+    ou ("error", mensagem).
+    """
+
+    def __init__(self, path, encoding=None):
+        super().__init__(daemon=True)
+        self.path = path
+        self.encoding = encoding
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            with Tracing.span("file.load", path=self.path) as trace:
+                with open(self.path, "rb") as file:
+                    raw = file.read()
+                text, encoding, newline = decode(raw, self.encoding)
+                line_count = text.count("\n") + 1
+                trace.set(bytes=len(raw), encoding=encoding, lines=line_count)
+        except (OSError, UnicodeDecodeError, LookupError) as e:
+            self.events.put(("error", str(e)))
+            return
+
+        self.events.put(("opened", encoding, newline, line_count))
+        for chunk in split_chunks(text):
+            if self.cancel_event.is_set():
+                return
+            self.events.put(("chunk", chunk))
+        self.events.put(("done",))
+
+class FileSaver(threading.Thread):
+    """
+    Gravações atômicas em segundo plano, na ordem em que foram pedidas.
+    Resultados em self.results: ("saved", caminho, bytes) ou ("error", caminho, mensagem).
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+
+    def submit(self, path, text, encoding="utf-8", newline="\n"):
+        self.requests.put((path, text, encoding, newline))
+
+    def run(self):
+        while True:
+            path, text, encoding, newline = self.requests.get()
+            try:
+                with Tracing.span("file.save", path=path, encoding=encoding) as trace:
+                    size = atomic_write(path, text, encoding, newline)
+                    trace.set(bytes=size)
+                self.results.put(("saved", path, size))
+            except (OSError, UnicodeEncodeError) as e:
+                self.results.put(("error", path, str(e)))
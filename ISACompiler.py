@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import re
+import Tracing
+from SyntaxHighlighter import build_token_pattern
+
+# Raiz do cache em disco (ISAs compiladas, objetos montados)
+CACHE_ROOT = os.environ.get("BIP_ACE_CACHE", os.path.join(os.path.expanduser("~"), ".bip_ace_cache"))
+
+CACHE_VERSION = 2
+NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+BINARY = re.compile(r"^[01]+$")
+
+class ISAException(Exception):
+    """
+    Exceção personalizada para configurações de ISA inválidas.
+    """
+    def __init__(self, message, path=None):
+        super().__init__(message)
+        self.path = path
+
+    def __str__(self):
+        details = f"ISA inválida: {super().__str__()}"
+        if self.path:
+            details += f" | Arquivo: {self.path}"
+        return details
+
+class CompiledISA:
+    """
+    ISA validada e compilada em tabelas inteiras.
+
+    - encoding: instrução -> (opcode << 12, tem operando)
+    - opcodes: instrução -> opcode (0-15)
+    - registers: registrador -> valor do operando
+    - token_regex: tokenizador do destaque de sintaxe (sempre gerado na carga,
+      nunca lido do cache: mudanças em build_token_pattern valem de imediato)
+    """
+
+    def __init__(self, content_hash, config, opcodes, formats, registers):
+        self.content_hash = content_hash
+        self.config = config                # JSON original
+        self.opcodes = opcodes
+        self.formats = formats              # instrução -> formato (0 = sem operando, 1 = um operando)
+        self.registers = registers
+        self.token_pattern = build_token_pattern(opcodes.keys(), registers.keys())
+        self.token_regex = re.compile(self.token_pattern)
+        self.encoding = {name: (opcode << 12, formats[name] == 1) for name, opcode in opcodes.items()}
+
+    @property
+    def instructions(self):
+        return self.opcodes.keys()
+
+    def to_cache(self):
+        return {
+            "version": CACHE_VERSION,
+            "content_hash": self.content_hash,
+            "config": self.config,
+            "opcodes": self.opcodes,
+            "formats": self.formats,
+            "registers": self.registers,
+        }
+
+    @classmethod
+    def from_cache(cls, data):
+        return cls(data["content_hash"], data["config"], data["opcodes"], data["formats"], data["registers"])
+
+def compile_isa(config, content_hash=None, path=None):
+    """
+    Valida uma configuração de ISA (dict do JSON) e gera as tabelas compiladas.
+
+    :raises ISAException: se a configuração for inválida
+    """
+    if content_hash is None:
+        content_hash = hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+    if not isinstance(config, dict):
+        raise ISAException("o arquivo deve conter um objeto JSON", path)
+
+    instructions = config.get("instructions")
+    if not isinstance(instructions, dict) or not instructions:
+        raise ISAException('"instructions" deve ser um objeto {nome: {"opcode", "format"}} não vazio', path)
+
+    registers = config.get("registers", {})
+    if not isinstance(registers, dict):
+        raise ISAException('"registers" deve ser um objeto {nome: valor binário}', path)
+
+    opcodes = {}
+    formats = {}
+    used_opcodes = {}
+    for name, instruction in instructions.items():
+        if not NAME.match(name):
+            raise ISAException(f"nome de instrução inválido: {name!r}", path)
+        if not isinstance(instruction, dict):
+            raise ISAException(f"{name}: a definição deve ser um objeto", path)
+
+        opcode = instruction.get("opcode")
+        if not isinstance(opcode, str) or not BINARY.match(opcode) or len(opcode) != 4:
+            raise ISAException(f"{name}: opcode deve ser uma string binária de 4 bits", path)
+        if opcode in used_opcodes:
+            raise ISAException(f"{name}: opcode {opcode} já usado por {used_opcodes[opcode]}", path)
+        used_opcodes[opcode] = name
+
+        format_type = instruction.get("format")
+        if format_type not in ("0", "1"):
+            raise ISAException(f"{name}: formato desconhecido {format_type!r} (use \"0\" ou \"1\")", path)
+
+        opcodes[name] = int(opcode, 2)
+        formats[name] = int(format_type)
+
+    register_values = {}
+    for name, value in registers.items():
+        if not NAME.match(name):
+            raise ISAException(f"nome de registrador inválido: {name!r}", path)
+        if name in opcodes:
+            raise ISAException(f"{name} é ao mesmo tempo instrução e registrador", path)
+        if not isinstance(value, str) or not BINARY.match(value) or len(value) > 12:
+            raise ISAException(f"registrador {name}: valor deve ser uma string binária de até 12 bits", path)
+        register_values[name] = int(value, 2)
+
+    return CompiledISA(content_hash, config, opcodes, formats, register_values)
+
+# Cache em memória: hash do conteúdo -> CompiledISA
+_compiled = {}
+
+def load_isa(path, cache_dir=os.path.join(CACHE_ROOT, "isa")):
+    """
+    Carrega uma ISA a partir de um arquivo JSON, usando o cache (memória e disco)
+    indexado pelo hash do conteúdo do arquivo.
+
+    :raises ISAException: se o arquivo for inválido
+    :raises OSError: se o arquivo não puder ser lido
+    """
+    with Tracing.span("isa.load", path=path) as trace:
+        with open(path, "rb") as file:
+            raw = file.read()
+        content_hash = hashlib.sha256(raw).hexdigest()
+
+        isa = _compiled.get(content_hash)
+        if isa is not None:
+            trace.set(source="memory")
+            return isa
+
+        cache_path = os.path.join(cache_dir, f"{content_hash}.json") if cache_dir else None
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+                if data.get("version") == CACHE_VERSION and data.get("content_hash") == content_hash:
+                    isa = _compiled[content_hash] = CompiledISA.from_cache(data)
+                    trace.set(source="disk")
+                    return isa
+            except (OSError, ValueError, KeyError):
+                pass  # Cache corrompido: recompila
+
+        try:
+            config = json.loads(raw.decode("utf-8"))
+        except ValueError as e:
+            raise ISAException(f"JSON malformado ({e})", path)
+
+        isa = _compiled[content_hash] = compile_isa(config, content_hash, path)
+        trace.set(source="compiled")
+
+        if cache_path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                temp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as file:
+                    json.dump(isa.to_cache(), file)
+                os.replace(temp_path, cache_path)
+            except OSError:
+                pass  # O cache em disco é apenas uma otimização
+
+        return isa
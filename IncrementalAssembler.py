@@ -0,0 +1,240 @@
+import operator
+from itertools import accumulate, compress, count, islice, repeat
+import Tracing
+from AssemblerCore import AssemblerCore, AssemblyException, AssemblyResult
+from ProgramImage import ProgramImage
+
+DIRECTIVES = (".include", ".extern")    # Como em Linker: arquivos com essas diretivas são ligados
+MEMORY_SIZE = 2**12
+
+def count_linked(lines):
+    """Quantidade de linhas com .include/.extern (ver Linker.has_directives)."""
+    return sum(1 for line in lines if line.split(";")[0].strip().startswith(DIRECTIVES))
+
+class IncrementalAssembler:
+    """
+    Estado de montagem persistente de um documento.
+
+    Cada linha guarda seus tokens, a palavra codificada sem os rótulos e o
+    erro próprio da linha, em listas paralelas às linhas do documento. Os
+    índices globais (definições, referências e .extern) são contadores por
+    rótulo, sem números de linha: uma edição re-tokeniza apenas as linhas
+    alteradas e não desloca nada, qualquer que seja o tamanho do documento.
+
+    Endereços (de linhas e de rótulos) e os erros de rótulos indefinidos são
+    calculados na leitura, e a imagem completa apenas em result().
+
+    Com .include/.extern, as linhas iniciadas por "." seguem as regras de
+    Linker.assemble_object: não ocupam endereço, .extern declara símbolos
+    resolvidos na ligação e outras diretivas são inválidas.
+    """
+
+    def __init__(self, isa):
+        self.core = AssemblerCore(isa)
+        self.text_lines = []        # Texto de cada linha do documento
+        self.records = []           # Tokens: (rótulo, instrução, operando) ou None (vazia, comentário, diretiva)
+        self.label_names = []       # Rótulo definido na linha, ou None
+        self.flags = []             # 1 nas linhas de instrução (inclusive com erro): ocupam um endereço
+        self.words = []             # Palavra sem o endereço do rótulo referenciado (None se há erro)
+        self.line_errors = []       # Mensagem de erro da própria linha, ou None
+        self.operand_labels = []    # Rótulo usado como operando, ou None
+        self.line_externs = []      # Símbolos declarados com .extern na linha, ou None
+
+        self.defined = {}           # Rótulo -> número de definições (vale a última)
+        self.referenced = {}        # Rótulo -> número de instruções que o usam
+        self.externs = {}           # Símbolo -> número de declarações .extern
+        self.unresolved = set()     # Rótulos referenciados sem definição nem .extern
+        self.linked = 0             # Linhas com .include/.extern
+        self.instruction_count = 0
+        self._errors = None         # Cache de errors (descartado a cada edição)
+
+    # --- Edição
+
+    def update_text(self, source):
+        """Atualiza o documento inteiro, re-montando apenas o trecho que difere do texto anterior."""
+        new_lines = source.split("\n")
+        old_lines = self.text_lines
+
+        # Prefixo e sufixo em comum com o texto anterior (comparação no laço do map, em C)
+        limit = min(len(old_lines), len(new_lines))
+        prefix = next(compress(count(), map(operator.ne, old_lines, new_lines)), limit)
+        suffix = next(compress(count(), map(operator.ne, reversed(old_lines), reversed(new_lines))), limit)
+        suffix = min(suffix, limit - prefix)
+
+        self.update_lines(prefix + 1, len(old_lines) - suffix, new_lines[prefix:len(new_lines) - suffix])
+
+    def update_lines(self, first, last, new_lines):
+        """
+        Substitui as linhas [first, last] (a partir de 1; last = first - 1 para inserir)
+        pelas linhas new_lines. O custo depende apenas do número de linhas do trecho.
+        """
+        with Tracing.span("assemble.incremental", lines=len(new_lines), replaced=last - first + 1):
+            touched = set()
+            for index in range(first - 1, last):
+                self.count_line(index, -1, touched)
+
+            linked = self.linked
+            self.linked += count_linked(new_lines) - count_linked(self.text_lines[first - 1:last])
+            self.text_lines[first - 1:last] = new_lines
+            self.replace(first, last, [self.parse(line) for line in new_lines])
+            for index in range(first - 1, first - 1 + len(new_lines)):
+                self.count_line(index, 1, touched)
+            if bool(linked) != bool(self.linked):
+                self.reparse_directives(first, first - 1 + len(new_lines), touched)
+
+            for label in touched:
+                if self.referenced.get(label) and not self.defined.get(label) and not self.externs.get(label):
+                    self.unresolved.add(label)
+                else:
+                    self.unresolved.discard(label)
+            self._errors = None
+
+    def replace(self, first, last, parsed):
+        """Substitui o estado das linhas [first, last] pelas tuplas de parse()."""
+        columns = list(zip(*parsed)) or [()] * 7
+        for name, values in zip(("records", "label_names", "flags", "words", "line_errors",
+                                 "operand_labels", "line_externs"), columns):
+            getattr(self, name)[first - 1:last] = values
+
+    def reparse_directives(self, first, last, touched):
+        """
+        O documento entrou ou saiu do modo de ligação: re-interpreta as linhas
+        iniciadas por "." fora do trecho [first, last], já interpretado (raro: O(linhas)).
+        """
+        for index, line in enumerate(self.text_lines):
+            if not first - 1 <= index < last and line.split(";")[0].strip().startswith("."):
+                self.count_line(index, -1, touched)
+                self.replace(index + 1, index + 1, [self.parse(line)])
+                self.count_line(index, 1, touched)
+
+    def count_line(self, index, sign, touched):
+        """Acrescenta (sign = 1) ou retira (-1) uma linha dos contadores globais."""
+        label = self.label_names[index]
+        if label is not None:
+            self.defined[label] = self.defined.get(label, 0) + sign
+            touched.add(label)
+        operand = self.operand_labels[index]
+        if operand is not None:
+            self.referenced[operand] = self.referenced.get(operand, 0) + sign
+            touched.add(operand)
+        for symbol in self.line_externs[index] or ():
+            self.externs[symbol] = self.externs.get(symbol, 0) + sign
+            touched.add(symbol)
+        self.instruction_count += sign * self.flags[index]
+
+    def parse(self, line):
+        """
+        Estado de uma linha: (tokens, rótulo definido, ocupa endereço, palavra,
+        erro, rótulo referenciado, símbolos .extern). Mesmas regras de
+        strip_comments/tokenize (e de Linker.assemble_object, no modo de ligação).
+        """
+        code = line.split(";")[0].strip()
+        if not code:
+            return None, None, 0, None, None, None, None
+
+        if code.startswith(".") and self.linked:
+            directive, _, argument = code.partition(" ")
+            argument = argument.strip()
+            if directive == ".extern" and argument:
+                return None, None, 0, None, None, None, tuple(argument.replace(",", " ").split())
+            if directive == ".include" and argument:
+                return None, None, 0, None, None, None, None
+            return None, None, 0, None, f"Invalid directive {code}", None, None
+
+        if ":" in code:
+            label = code.split(":")[0].strip()
+            return (label, None, None), label, 0, None, None, None, None
+
+        parts = code.split()
+        instr = parts[0]
+        operand = parts[1] if len(parts) > 1 else None
+        core = self.core
+        try:
+            opcode_bits, has_operand = core.lookup(instr, 0)
+            if not has_operand:
+                return (None, instr, operand), None, 1, opcode_bits, None, None, None
+            if operand is not None and operand not in core.isa.registers and not operand.isdigit():
+                return (None, instr, operand), None, 1, opcode_bits, None, operand, None
+            word = opcode_bits | core.operand_value(instr, operand, 0, {})
+            return (None, instr, operand), None, 1, word, None, None, None
+        except AssemblyException as e:
+            return (None, instr, operand), None, 1, None, e.args[0], None, None
+
+    # --- Leitura
+
+    @property
+    def errors(self):
+        """Linha -> AssemblyException, em ordem de linha (calculado na primeira leitura após uma edição)."""
+        if self._errors is None:
+            messages = [(index + 1, self.line_errors[index]) for index in
+                        compress(count(), map(operator.is_not, self.line_errors, repeat(None)))]
+            if self.unresolved:
+                messages += [(index + 1, f"Invalid operand {self.operand_labels[index]}") for index in
+                             compress(count(), map(self.unresolved.__contains__, self.operand_labels))]
+            if self.instruction_count > MEMORY_SIZE and not self.linked:
+                # Só com mais de 4096 instruções um rótulo fica fora da faixa de 12 bits
+                labels = self.labels
+                messages += [(index + 1, f"Operand {label} out of 12-bit range")
+                             for index, label in enumerate(self.operand_labels)
+                             if label is not None and labels.get(label, 0) >= MEMORY_SIZE]
+            messages.sort()
+            self._errors = {line: AssemblyException(message, line) for line, message in messages}
+        return self._errors
+
+    def definition_lines(self, label):
+        """Linhas (a partir de 1) em que o rótulo é definido; vale a última."""
+        if not self.defined.get(label):
+            return []
+        return [index + 1 for index in compress(count(), map(operator.eq, self.label_names, repeat(label)))]
+
+    def duplicate_labels(self):
+        return [label for label, definitions in self.defined.items() if definitions > 1]
+
+    def address_of(self, line):
+        """Endereço da instrução de uma linha (a partir de 1), ou None."""
+        if line > len(self.flags) or not self.flags[line - 1]:
+            return None
+        return sum(islice(self.flags, line - 1))
+
+    def label_address(self, label):
+        """Endereço atual de um rótulo (None se não definido)."""
+        lines = self.definition_lines(label)
+        if not lines:
+            return None
+        return sum(islice(self.flags, lines[-1] - 1))
+
+    def word(self, line):
+        """Palavra montada de uma linha de instrução, ou None (linha sem instrução ou com erro)."""
+        if line in self.errors or self.address_of(line) is None:
+            return None
+        label = self.operand_labels[line - 1]
+        word = self.words[line - 1]
+        if label is not None and self.defined.get(label):
+            word |= self.label_address(label)
+        return word
+
+    @property
+    def labels(self):
+        """Rótulo -> endereço de todos os rótulos definidos."""
+        addresses = list(accumulate(self.flags, initial=0))
+        return {self.label_names[index]: addresses[index] for index in
+                compress(count(), map(operator.is_not, self.label_names, repeat(None)))}
+
+    def result(self):
+        """
+        Exporta o estado atual como um AssemblyResult independente (a imagem é
+        gerada aqui, em uma passagem pelas linhas; as edições não a percorrem).
+        """
+        with Tracing.span("assemble.export", lines=len(self.text_lines)) as trace:
+            labels = self.labels
+            errors = self.errors
+            image = ProgramImage()
+            words, operand_labels = self.words, self.operand_labels
+            for index in compress(count(), self.flags):
+                line = index + 1
+                if line in errors:
+                    continue    # Como na montagem completa, instruções com erro não entram na imagem
+                label = operand_labels[index]
+                image.append(words[index] if label is None else words[index] | labels.get(label, 0), line)
+            trace.set(words=len(image))
+        return AssemblyResult(image, labels, list(errors.values()))
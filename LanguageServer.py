@@ -0,0 +1,433 @@
+"""
+Servidor LSP (Language Server Protocol) para o Assembly do BIP, via stdio.
+
+Cada documento aberto mantém um IncrementalAssembler: as alterações
+incrementais do editor re-tokenizam e re-montam apenas as linhas do trecho
+alterado. Oferece diagnósticos, ir para a definição de rótulos, hover com
+opcode e codificação, e semantic tokens.
+
+Uso:
+    python LanguageServer.py [--isa configs/default_isa.json]
+
+A ISA também pode ser informada nas initializationOptions: {"isa": "caminho.json"}.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import traceback
+import Tracing
+from Diagnostics import span
+from IncrementalAssembler import IncrementalAssembler
+from ISACompiler import ISAException, load_isa
+from SyntaxHighlighter import tokenize_line
+
+DEFAULT_ISA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "configs", "default_isa.json")
+
+# Legenda dos semantic tokens
+TOKEN_TYPES = ["keyword", "variable", "function", "comment", "number"]
+TOKEN_MODIFIERS = ["declaration"]
+TAG_TYPES = {"instruction": 0, "register": 1, "label": 2, "comment": 3, "number": 4}
+DECLARATION = 1
+
+SEVERITY_ERROR = 1
+SEVERITY_WARNING = 2
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SERVER_NOT_INITIALIZED = -32002
+
+WORD_REGEX = re.compile(r"[A-Za-z_.][A-Za-z0-9_.]*|\d+")
+IDENTIFIER_REGEX = re.compile(r"\b[A-Za-z_][A-Za-z0-9_]*\b")
+
+def line_tokens(isa, line):
+    """
+    Semantic tokens de uma linha: (coluna, tamanho, tipo, modificadores).
+    Além dos tokens do destaque de sintaxe, marca as referências a rótulos (operandos).
+    """
+    tokens = []
+    comment_start = len(line)
+    for tag, start, end in tokenize_line(isa.token_regex, line):
+        if tag == "label":
+            # O padrão inclui o recuo e os dois-pontos: marca apenas o nome
+            name = line[start:end].strip()[:-1]
+            start = line.index(name, start)
+            tokens.append((start, len(name), TAG_TYPES[tag], DECLARATION))
+        else:
+            tokens.append((start, end - start, TAG_TYPES[tag], 0))
+            if tag == "comment":
+                comment_start = start
+
+    # Identificadores restantes antes do comentário (fora das diretivas): referências a rótulos
+    if not line.lstrip().startswith("."):
+        for match in IDENTIFIER_REGEX.finditer(line, 0, comment_start):
+            if not any(start <= match.start() < start + length for start, length, _, _ in tokens):
+                tokens.append((match.start(), match.end() - match.start(), TAG_TYPES["label"], 0))
+
+    tokens.sort()
+    return tokens
+
+def check_position(position):
+    """
+    (linha, caractere) de uma posição do LSP.
+
+    :raises ValueError: valores negativos ou não inteiros (índices negativos
+                        voltariam do fim da lista de linhas)
+    """
+    line, character = position["line"], position["character"]
+    if type(line) is not int or type(character) is not int or line < 0 or character < 0:
+        raise ValueError(f"Invalid position {position}")
+    return line, character
+
+class Document:
+    """Estado de um documento aberto: linhas, montagem incremental e tokens por linha."""
+
+    def __init__(self, uri, text, isa):
+        self.uri = uri
+        self.isa = isa
+        self.assembler = IncrementalAssembler(isa)
+        self.lines = []
+        self.tokens = []            # Semantic tokens de cada linha (ver line_tokens)
+        self.replace_lines(1, 0, text.split("\n"))
+
+    def replace_lines(self, first, last, new_lines):
+        """Substitui as linhas [first, last] (a partir de 1) e re-monta apenas esse trecho."""
+        new_lines = [line.rstrip("\r") for line in new_lines]
+        tokens = [line_tokens(self.isa, line) for line in new_lines]
+        self.assembler.update_lines(first, last, new_lines)   # Antes das listas: se falhar, nada muda
+        self.lines[first - 1:last] = new_lines
+        self.tokens[first - 1:last] = tokens
+
+    def apply_change(self, change, to_column):
+        """Aplica uma alteração do LSP (trecho ou documento inteiro)."""
+        if "range" not in change:
+            self.replace_lines(1, len(self.lines), change["text"].split("\n"))
+            return
+
+        start_line, start_character = check_position(change["range"]["start"])
+        end_line, end_character = check_position(change["range"]["end"])
+        if (end_line, end_character) < (start_line, start_character):
+            raise ValueError(f"Invalid range {change['range']}")
+        first_line = self.lines[start_line] if start_line < len(self.lines) else ""
+        last_line = self.lines[end_line] if end_line < len(self.lines) else ""
+        text = (first_line[:to_column(first_line, start_character)] + change["text"]
+                + last_line[to_column(last_line, end_character):])
+        last = min(end_line + 1, len(self.lines))
+        self.replace_lines(start_line + 1, last, text.split("\n"))
+
+    def word_at(self, line, column):
+        """Palavra (identificador ou número) sob a coluna, ou None."""
+        text = self.lines[line] if line < len(self.lines) else ""
+        for match in WORD_REGEX.finditer(text.split(";")[0]):
+            if match.start() <= column <= match.end():
+                return match.group()
+        return None
+
+class LanguageServer:
+    """
+    Tratamento das mensagens JSON-RPC. O envio é feito pela função `send`
+    (uma mensagem por chamada), o que permite usar o servidor sem stdio.
+    """
+
+    def __init__(self, send, isa_path=DEFAULT_ISA):
+        self.send = send
+        self.isa_path = isa_path
+        self.isa = None
+        self.documents = {}
+        self.utf16 = True           # Codificação das colunas (padrão do LSP: UTF-16)
+        self.initialized = False
+        self.shutdown_requested = False
+        self.exit_code = None
+
+    # --- Protocolo
+
+    def handle(self, message):
+        """
+        Trata uma mensagem. Nenhuma exceção de um método derruba o servidor:
+        parâmetros inválidos respondem INVALID_PARAMS, demais falhas são
+        registradas em stderr e respondem INTERNAL_ERROR (notificações são descartadas).
+        """
+        if not isinstance(message, dict):
+            self.respond_error(None, INVALID_REQUEST, "Invalid request")
+            return
+        method = message.get("method")
+        params = message.get("params") or {}
+        request_id = message.get("id")
+
+        if method is None:
+            return  # Resposta a uma requisição do servidor: não utilizada
+
+        if method == "exit":
+            self.exit_code = 0 if self.shutdown_requested else 1
+            return
+
+        handler = getattr(self, "on_" + method.replace("/", "_").replace("$", "dollar"), None)
+        if request_id is None:  # Notificação: sem resposta
+            if handler is not None and (self.initialized or method == "initialized"):
+                try:
+                    with Tracing.span("lsp." + method):
+                        handler(params)
+                except Exception:
+                    self.log_exception(method)
+            return
+
+        if not self.initialized and method != "initialize":
+            self.respond_error(request_id, SERVER_NOT_INITIALIZED, "Server not initialized")
+        elif handler is None:
+            self.respond_error(request_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+        else:
+            try:
+                with Tracing.span("lsp." + method):
+                    result = handler(params)
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                self.respond_error(request_id, INVALID_PARAMS, f"Invalid params: {e}")
+            except (ISAException, OSError) as e:
+                self.respond_error(request_id, INVALID_PARAMS, str(e))
+            except Exception as e:
+                self.log_exception(method)
+                self.respond_error(request_id, INTERNAL_ERROR, f"Internal error: {e}")
+            else:
+                self.send({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+    @staticmethod
+    def log_exception(method):
+        """Registra em stderr (stdout é o canal do protocolo) a exceção em tratamento."""
+        Tracing.event("lsp.error", method=method)
+        print(f"bip-ace: error handling {method}", file=sys.stderr)
+        traceback.print_exc(file=sys.stderr)
+
+    def respond_error(self, request_id, code, message):
+        self.send({"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}})
+
+    def notify(self, method, params):
+        self.send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    # --- Colunas (o LSP conta em unidades UTF-16 por padrão)
+
+    def to_column(self, line, character):
+        """Posição do LSP -> índice na string."""
+        if not self.utf16 or line.isascii():
+            return min(character, len(line))
+        units = 0
+        for index, char in enumerate(line):
+            if units >= character:
+                return index
+            units += 2 if ord(char) > 0xFFFF else 1
+        return len(line)
+
+    def from_column(self, line, column):
+        """Índice na string -> posição do LSP."""
+        if not self.utf16 or line.isascii():
+            return column
+        return column + sum(1 for char in line[:column] if ord(char) > 0xFFFF)
+
+    def position_range(self, document, line, start, end):
+        text = document.lines[line - 1] if line - 1 < len(document.lines) else ""
+        end = len(text) if end is None else end
+        return {"start": {"line": line - 1, "character": self.from_column(text, start)},
+                "end": {"line": line - 1, "character": self.from_column(text, end)}}
+
+    # --- Ciclo de vida
+
+    def on_initialize(self, params):
+        options = params.get("initializationOptions") or {}
+        self.isa_path = options.get("isa", self.isa_path)
+        self.isa = load_isa(self.isa_path)
+
+        encodings = ((params.get("capabilities") or {}).get("general") or {}).get("positionEncodings") or []
+        self.utf16 = "utf-32" not in encodings
+        self.initialized = True
+
+        return {
+            "capabilities": {
+                "positionEncoding": "utf-16" if self.utf16 else "utf-32",
+                "textDocumentSync": {"openClose": True, "change": 2},   # 2: incremental
+                "definitionProvider": True,
+                "hoverProvider": True,
+                "semanticTokensProvider": {
+                    "legend": {"tokenTypes": TOKEN_TYPES, "tokenModifiers": TOKEN_MODIFIERS},
+                    "full": True,
+                },
+            },
+            "serverInfo": {"name": "bip-ace"},
+        }
+
+    def on_initialized(self, params):
+        pass
+
+    def on_shutdown(self, params):
+        self.shutdown_requested = True
+        return None
+
+    # --- Sincronização de documentos
+
+    def on_textDocument_didOpen(self, params):
+        item = params["textDocument"]
+        document = self.documents[item["uri"]] = Document(item["uri"], item["text"], self.isa)
+        self.publish_diagnostics(document)
+
+    def on_textDocument_didChange(self, params):
+        document = self.documents.get(params["textDocument"]["uri"])
+        if document is None:
+            return
+        for change in params["contentChanges"]:
+            document.apply_change(change, self.to_column)
+        self.publish_diagnostics(document)
+
+    def on_textDocument_didClose(self, params):
+        uri = params["textDocument"]["uri"]
+        if self.documents.pop(uri, None) is not None:
+            self.notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+
+    def on_textDocument_didSave(self, params):
+        pass
+
+    # --- Diagnósticos
+
+    def publish_diagnostics(self, document):
+        """Erros da montagem incremental e rótulos duplicados (sem re-montar o documento)."""
+        assembler = document.assembler
+        diagnostics = []
+
+        for line, error in sorted(assembler.errors.items()):
+            text = document.lines[line - 1]
+            record = assembler.records[line - 1]
+            if record is None:  # Diretiva inválida: a linha inteira
+                start, end = span(text, text.split(";")[0].strip())
+            else:
+                label, instr, operand = record
+                start, end = span(text, instr)
+                if operand is not None:
+                    end = span(text, operand, end or 0)[1] or end
+            diagnostics.append({"range": self.position_range(document, line, start, end),
+                                "severity": SEVERITY_ERROR, "source": "bip-ace", "message": error.args[0]})
+
+        for label in assembler.duplicate_labels():
+            lines = assembler.definition_lines(label)
+            for line in lines[1:]:
+                start, end = span(document.lines[line - 1], label)
+                diagnostics.append({"range": self.position_range(document, line, start, end),
+                                    "severity": SEVERITY_WARNING, "source": "bip-ace",
+                                    "message": f"Duplicate label {label} (first defined at line {lines[0]})"})
+
+        diagnostics.sort(key=lambda diagnostic: diagnostic["range"]["start"]["line"])
+        self.notify("textDocument/publishDiagnostics", {"uri": document.uri, "diagnostics": diagnostics})
+
+    # --- Navegação e informações
+
+    def on_textDocument_definition(self, params):
+        document = self.documents[params["textDocument"]["uri"]]
+        line, character = check_position(params["position"])
+        text = document.lines[line] if line < len(document.lines) else ""
+        word = document.word_at(line, self.to_column(text, character))
+        lines = document.assembler.definition_lines(word)
+        if not lines:
+            return None
+
+        definition = lines[-1]  # Vale a última definição
+        start, end = span(document.lines[definition - 1], word)
+        return {"uri": document.uri, "range": self.position_range(document, definition, start, end)}
+
+    def on_textDocument_hover(self, params):
+        document = self.documents[params["textDocument"]["uri"]]
+        line, character = check_position(params["position"])
+        text = document.lines[line] if line < len(document.lines) else ""
+        word = document.word_at(line, self.to_column(text, character))
+        if word is None:
+            return None
+
+        isa = document.isa
+        assembler = document.assembler
+        if word in isa.encoding:
+            opcode_bits, has_operand = isa.encoding[word]
+            opcode = isa.opcodes[word]
+            contents = [f"**{word}**: opcode `{opcode:04b}` (0x{opcode:X}), "
+                        + ("12-bit operand" if has_operand else "no operand")]
+            address = assembler.address_of(line + 1)
+            machine_word = assembler.word(line + 1)
+            if machine_word is not None:
+                contents.append(f"Address 0x{address:03X}: `{machine_word:016b}` (0x{machine_word:04X})")
+        elif assembler.label_address(word) is not None:
+            address = assembler.label_address(word)
+            contents = [f"**{word}**: label at address 0x{address:03X} ({address})"]
+        elif word in isa.registers:
+            contents = [f"**{word}**: register (operand {isa.registers[word]})"]
+        elif word.isdigit():
+            value = int(word)
+            contents = [f"{value} = 0x{value:X} = `{value:b}`"
+                        + ("" if value < 2**12 else " (out of 12-bit range)")]
+        else:
+            return None
+
+        return {"contents": {"kind": "markdown", "value": "\n\n".join(contents)}}
+
+    def on_textDocument_semanticTokens_full(self, params):
+        """Tokens do documento inteiro, a partir dos tokens já calculados de cada linha."""
+        document = self.documents[params["textDocument"]["uri"]]
+        data = []
+        previous_line = previous_start = 0
+        for line, tokens in enumerate(document.tokens):
+            if not tokens:
+                continue
+            text = document.lines[line]
+            for start, length, token_type, modifiers in tokens:
+                if not text.isascii():
+                    start, length = (self.from_column(text, start),
+                                     self.from_column(text, start + length) - self.from_column(text, start))
+                delta_start = start - previous_start if line == previous_line else start
+                data.extend((line - previous_line, delta_start, length, token_type, modifiers))
+                previous_line, previous_start = line, start
+        return {"data": data}
+
+def read_message(stream):
+    """Lê uma mensagem com cabeçalho Content-Length (None no fim do fluxo)."""
+    length = None
+    while True:
+        header = stream.readline()
+        if not header:
+            return None
+        header = header.strip()
+        if not header:
+            break
+        name, _, value = header.decode("ascii").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    if length is None:
+        return None
+    return json.loads(stream.read(length).decode("utf-8"))   # ValueError: conteúdo inválido
+
+def message_writer(stream):
+    """Função de envio de mensagens JSON-RPC para um fluxo binário."""
+    lock = threading.Lock()
+
+    def send(message):
+        body = json.dumps(message).encode("utf-8")
+        with lock:
+            stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+            stream.flush()
+    return send
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BIP-ACE: servidor LSP (stdio)")
+    parser.add_argument("--isa", default=DEFAULT_ISA)
+    args = parser.parse_args(argv)
+
+    server = LanguageServer(message_writer(sys.stdout.buffer), args.isa)
+    while server.exit_code is None:
+        try:
+            message = read_message(sys.stdin.buffer)
+        except ValueError as e:
+            server.respond_error(None, PARSE_ERROR, f"Parse error: {e}")
+            continue
+        if message is None:
+            return 1
+        server.handle(message)
+    return server.exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+import Tracing
+from AssemblerCore import AssemblerCore, AssemblyException, strip_comments, tokenize
+from ISACompiler import CACHE_ROOT
+from ProgramImage import ProgramImage
+
+OBJECT_VERSION = 1
+DIRECTIVES = (".include", ".extern")
+
+class LinkException(Exception):
+    """
+    Exceção personalizada para erros de montagem/ligação de programas com vários arquivos.
+    """
+    def __init__(self, message, errors=()):
+        super().__init__(message)
+        self.errors = list(errors)  # Mensagens detalhadas ("arquivo: ERROR LINE n: ...")
+
+    def __str__(self):
+        return "\n".join([super().__str__()] + self.errors)
+
+def has_directives(source):
+    """Indica se o código-fonte usa .include/.extern (e precisa ser ligado)."""
+    return any(line.startswith(DIRECTIVES) for _, line in strip_comments(source.split("\n")))
+
+class ObjectFile:
+    """
+    Objeto relocável de um arquivo fonte.
+
+    - words: palavras montadas, com o campo de operando zerado nas relocações
+    - symbols: rótulos definidos no arquivo -> deslocamento (exportados)
+    - relocations: (deslocamento, símbolo, local?) dos operandos que são rótulos
+    - includes / externs: dependências e símbolos de outros arquivos
+    """
+
+    def __init__(self, name, words=(), source_lines=(), symbols=None, relocations=(), includes=(), externs=(), errors=()):
+        self.name = name
+        self.words = list(words)
+        self.source_lines = list(source_lines)
+        self.symbols = dict(symbols or {})
+        self.relocations = [tuple(relocation) for relocation in relocations]
+        self.includes = list(includes)
+        self.externs = list(externs)
+        self.errors = list(errors)      # AssemblyException (objetos com erro não vão para o cache)
+
+    def to_json(self):
+        return {
+            "version": OBJECT_VERSION,
+            "name": self.name,
+            "words": self.words,
+            "source_lines": self.source_lines,
+            "symbols": self.symbols,
+            "relocations": self.relocations,
+            "includes": self.includes,
+            "externs": self.externs,
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data["name"], data["words"], data["source_lines"], data["symbols"],
+                   data["relocations"], data["includes"], data["externs"])
+
+def assemble_object(core, lines, name):
+    """
+    Monta um arquivo fonte em um ObjectFile.
+
+    :param core: AssemblerCore com a ISA em uso
+    :param lines: Iterável de linhas do arquivo
+    :param name: Nome do arquivo (mensagens e mapa de fonte)
+    """
+    obj = ObjectFile(name)
+    references = []     # (deslocamento, rótulo, linha)
+
+    def code_lines():
+        """Separa as diretivas das linhas de código."""
+        for line_number, line in strip_comments(lines):
+            if not line.startswith("."):
+                yield line_number, line
+                continue
+            directive, _, argument = line.partition(" ")
+            argument = argument.strip()
+            if directive == ".include" and argument:
+                obj.includes.append(argument.strip('"'))
+            elif directive == ".extern" and argument:
+                obj.externs.extend(symbol for symbol in argument.replace(",", " ").split())
+            else:
+                obj.errors.append(AssemblyException(f"Invalid directive {line}", line_number))
+
+    registers = core.isa.registers
+    address = 0
+    for line_number, label, instr, operand in tokenize(code_lines()):
+        if label is not None:  # Definição de rótulo
+            obj.symbols[label] = address
+            continue
+
+        address += 1
+        try:
+            opcode_bits, has_operand = core.lookup(instr, line_number)
+            word = opcode_bits
+            if has_operand:
+                if operand is not None and operand not in registers and not operand.isdigit():
+                    references.append((len(obj.words), operand, line_number))
+                else:
+                    word |= core.operand_value(instr, operand, line_number, {})
+        except AssemblyException as e:
+            obj.errors.append(e)
+            word = 0
+        obj.words.append(word)
+        obj.source_lines.append(line_number)
+
+    # Rótulos locais têm precedência sobre os declarados com .extern
+    for offset, label, line_number in references:
+        if label in obj.symbols or label in obj.externs:
+            obj.relocations.append((offset, label, label in obj.symbols))
+        else:
+            obj.errors.append(AssemblyException(f"Invalid operand {label}", line_number))
+
+    obj.errors.sort(key=lambda error: error.line)
+    return obj
+
+class LinkResult:
+    """Programa ligado: imagem final, endereço de cada objeto e estatísticas do cache."""
+
+    def __init__(self, image, segments, assembled, cached):
+        self.image = image          # ProgramImage
+        self.segments = segments    # Lista de (endereço base, nome do arquivo, tamanho)
+        self.assembled = assembled  # Arquivos montados nesta construção
+        self.cached = cached        # Arquivos reaproveitados do cache de objetos
+
+    def to_map(self):
+        """Mapa de fonte: uma linha 'endereço : arquivo:linha' por trecho contínuo."""
+        entries = []
+        for base, name, size in self.segments:
+            previous = None
+            for address in range(base, base + size):
+                line = self.image.source_line(address)
+                if previous is None or line != previous + 1:
+                    entries.append(f"{address:X} : {name}:{line}")
+                previous = line
+        return "\n".join(entries)
+
+def link(objects):
+    """
+    Liga os objetos em sequência (o primeiro no endereço 0) e resolve as relocações.
+
+    :raises LinkException: símbolo externo indefinido ou ambíguo, ou programa maior que a memória
+    """
+    bases = []
+    address = 0
+    for obj in objects:
+        bases.append(address)
+        address += len(obj.words)
+    if address > ProgramImage.ADDRESS_SPACE:
+        raise LinkException(f"Programa com {address} palavras excede a memória de {ProgramImage.ADDRESS_SPACE}!")
+
+    exporters = {}
+    for obj, base in zip(objects, bases):
+        for symbol, offset in obj.symbols.items():
+            exporters.setdefault(symbol, []).append((obj.name, base + offset))
+
+    image = ProgramImage()
+    errors = []
+    for obj, base in zip(objects, bases):
+        words = list(obj.words)
+        for offset, symbol, local in obj.relocations:
+            if local:
+                value = base + obj.symbols[symbol]
+            else:
+                definitions = exporters.get(symbol, [])
+                if len(definitions) != 1:
+                    problem = "indefinido" if not definitions else \
+                        "definido em " + ", ".join(name for name, _ in definitions)
+                    errors.append(f"{obj.name}: ERROR LINE {obj.source_lines[offset]}: Símbolo externo {symbol} {problem}")
+                    continue
+                value = definitions[0][1]
+            if value >= ProgramImage.ADDRESS_SPACE:
+                errors.append(f"{obj.name}: ERROR LINE {obj.source_lines[offset]}: Operand {symbol} out of 12-bit range")
+                continue
+            words[offset] |= value
+        for word, line in zip(words, obj.source_lines):
+            image.append(word, line)
+
+    if errors:
+        raise LinkException("Falha na ligação:", errors)
+    return image, bases
+
+class Linker:
+    """
+    Constrói programas com vários arquivos: monta cada arquivo em um objeto
+    relocável (com cache em disco pelo hash do conteúdo e da ISA) e liga os
+    objetos na imagem final.
+    """
+
+    def __init__(self, isa, encoding="latin-1", cache_dir=os.path.join(CACHE_ROOT, "objects")):
+        self.core = AssemblerCore(isa)
+        self.encoding = encoding
+        self.cache_dir = cache_dir
+
+    def object_key(self, raw):
+        """Chave do cache: versão do formato, ISA e conteúdo do arquivo."""
+        digest = hashlib.sha256(f"{OBJECT_VERSION}:{self.core.isa.content_hash}:".encode())
+        digest.update(raw)
+        return digest.hexdigest()
+
+    def load_object(self, path, raw, name):
+        """Retorna (ObjectFile, veio do cache?)."""
+        cache_path = os.path.join(self.cache_dir, f"{self.object_key(raw)}.json") if self.cache_dir else None
+
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r", encoding="utf-8") as file:
+                    obj = ObjectFile.from_json(json.load(file))
+                obj.name = name
+                return obj, True
+            except (OSError, ValueError, KeyError):
+                pass  # Cache corrompido: monta novamente
+
+        obj = assemble_object(self.core, raw.decode(self.encoding).split("\n"), name)
+        if cache_path and not obj.errors:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                temp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as file:
+                    json.dump(obj.to_json(), file)
+                os.replace(temp_path, cache_path)
+            except OSError:
+                pass  # O cache em disco é apenas uma otimização
+        return obj, False
+
+    def build(self, path, source=None):
+        """
+        Monta e liga um programa a partir do arquivo principal (endereço 0).
+
+        :param path: Caminho do arquivo principal (base dos .include relativos)
+        :param source: Texto do arquivo principal, se ainda não salvo (ex.: editor)
+        :raises LinkException: erros de montagem ou de ligação
+        :raises OSError: arquivo incluído não encontrado
+        """
+        objects = []
+        errors = []
+        assembled = cached = 0
+        visited = set()
+        pending = [(os.path.abspath(path), source)]
+        root_dir = os.path.dirname(pending[0][0])   # Nomes dos objetos relativos ao arquivo principal
+
+        # Percurso em profundidade, na ordem dos .include
+        while pending:
+            file_path, text = pending.pop()
+            if file_path in visited:
+                continue
+            visited.add(file_path)
+
+            if text is None:
+                with open(file_path, "rb") as file:
+                    raw = file.read()
+            else:
+                raw = text.encode(self.encoding, errors="replace")
+
+            obj, from_cache = self.load_object(file_path, raw, os.path.relpath(file_path, root_dir))
+            cached += from_cache
+            assembled += not from_cache
+            objects.append(obj)
+            errors.extend(f"{obj.name}: {error}" for error in obj.errors)
+
+            base_dir = os.path.dirname(file_path)
+            for include in reversed(obj.includes):
+                pending.append((os.path.abspath(os.path.join(base_dir, include)), None))
+
+        if errors:
+            raise LinkException("Falha na montagem:", errors)
+
+        with Tracing.span("link", objects=len(objects), assembled=assembled, cached=cached) as trace:
+            image, bases = link(objects)
+            trace.set(words=len(image))
+        segments = [(base, obj.name, len(obj.words)) for base, obj in zip(bases, objects)]
+        return LinkResult(image, segments, assembled, cached)
@@ -0,0 +1,155 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from Assets import load_image
+
+class MachineCodeView:
+    """
+    Janela reutilizável com a listagem do código de máquina.
+
+    A listagem é desenhada em um Canvas virtualizado: apenas as linhas visíveis
+    são renderizadas (com um conjunto fixo de itens de texto reaproveitados),
+    de modo que o custo de exibição independe do tamanho do programa.
+    Colunas: endereço, instrução em binário, em hexadecimal e linha do fonte.
+    """
+
+    COLUMNS = (("Addr", 5), ("Binary", 17), ("Hex", 5), ("Source", 0))
+
+    def __init__(self, root, theme, commands):
+        """
+        :param root: Janela principal
+        :param theme: Esquema de cores (dark_theme.json)
+        :param commands: Lista de (rótulo, função) dos botões
+        """
+        self.root = root
+        self.theme = theme
+        self.image = None
+        self.source_lines = []
+        self.segments = []
+        self.first_row = 0          # Primeira linha visível
+        self.items = []             # Itens de texto reaproveitados: uma lista por linha visível
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Machine Code Output")
+        self.window.geometry("800x1000")
+        self.window.configure(bg=theme.get('background'))
+        self.window.iconphoto(False, load_image("assets/assemble.png"))
+
+        # Fechar apenas esconde a janela; a próxima montagem a reutiliza
+        self.window.protocol("WM_DELETE_WINDOW", self.window.withdraw)
+
+        self.font = tkfont.Font(family="Cascadia Mono", size=14)
+        self.row_height = self.font.metrics("linespace") + 4
+        char_width = self.font.measure("0")
+        self.column_x = []
+        x = 10
+        for _, width in self.COLUMNS:
+            self.column_x.append(x)
+            x += width * char_width + 15
+
+        # Cabeçalho fixo
+        header = tk.Canvas(self.window, height=self.row_height + 6, bg=theme.get('line_separator'), highlightthickness=0)
+        header.pack(fill=tk.X, padx=10, pady=(10, 0))
+        for (title, _), x in zip(self.COLUMNS, self.column_x):
+            header.create_text(x, 3, text=title, anchor="nw", font=self.font, fill=theme.get('line_number_fg'))
+
+        list_frame = tk.Frame(self.window)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+        self.scrollbar = tk.Scrollbar(list_frame, command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.canvas = tk.Canvas(list_frame, bg=theme.get('background'), highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", lambda event: self.render())
+        self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-4>", lambda event: self.scroll_rows(-3))
+        self.canvas.bind("<Button-5>", lambda event: self.scroll_rows(3))
+
+        # Botões
+        button_frame = tk.Frame(self.window, bg=theme.get('background'))
+        button_frame.pack(pady=7)
+        for text, command in commands:
+            tk.Button(button_frame, text=text, command=command, font=("Courier New", 14, "bold"),
+                      bg="#187498", fg="white", padx=5).pack(side=tk.LEFT, padx=5)
+
+    def exists(self):
+        return bool(self.window.winfo_exists())
+
+    def show(self, image, source_lines, segments=None, summary=None):
+        """
+        Atualiza a listagem no lugar e traz a janela para frente.
+
+        :param image: ProgramImage montada
+        :param source_lines: Linhas do código-fonte (para a coluna Source)
+        :param segments: (base, arquivo, tamanho) de um programa ligado; o primeiro é o do editor
+        :param summary: Texto opcional exibido no título (ex.: relatório da otimização)
+        """
+        self.window.title("Machine Code Output" + (f" - {summary}" if summary else ""))
+        self.image = image
+        self.source_lines = source_lines
+        self.segments = segments or []
+        self.first_row = min(self.first_row, self.max_first_row())
+        self.window.deiconify()
+        self.window.lift()
+        self.render()
+
+    def visible_rows(self):
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def max_first_row(self):
+        return max(0, (len(self.image) if self.image else 0) - self.visible_rows())
+
+    def row_text(self, address):
+        """Textos das colunas de um endereço."""
+        word = self.image.words[address]
+        line = self.image.source_line(address)
+        if self.segments and address >= self.segments[0][2]:
+            # Palavra de um arquivo incluído: mostra apenas arquivo:linha
+            name = next(name for base, name, size in self.segments if base <= address < base + size)
+            return (f"{address:03X}", f"{word:016b}", f"{word:04X}", f"{line:>4}  [{name}]")
+        source = self.source_lines[line - 1].strip() if 0 < line <= len(self.source_lines) else ""
+        return (f"{address:03X}", f"{word:016b}", f"{word:04X}", f"{line:>4}  {source}")
+
+    def render(self):
+        """Desenha somente as linhas visíveis."""
+        if self.image is None:
+            return
+
+        rows = self.visible_rows()
+        total = len(self.image)
+
+        # Cria itens apenas quando a janela cresce; depois eles só mudam de texto
+        while len(self.items) < rows:
+            y = len(self.items) * self.row_height
+            self.items.append([self.canvas.create_text(x, y, anchor="nw", font=self.font, fill=self.theme.get(color))
+                               for x, color in zip(self.column_x, ("line_number_fg", "foreground", "instruction", "comment"))])
+
+        for row, items in enumerate(self.items):
+            address = self.first_row + row
+            texts = self.row_text(address) if row < rows and address < total else ("", "", "", "")
+            for item, text in zip(items, texts):
+                self.canvas.itemconfigure(item, text=text)
+
+        if total:
+            self.scrollbar.set(self.first_row / total, min(1.0, (self.first_row + rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_rows(self, delta):
+        first_row = max(0, min(self.first_row + delta, self.max_first_row()))
+        if first_row != self.first_row:
+            self.first_row = first_row
+            self.render()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        """Traduz os comandos da Scrollbar (moveto / scroll) em linhas."""
+        if self.image is None:
+            return
+        if action == "moveto":
+            self.scroll_rows(int(float(amount) * len(self.image)) - self.first_row)
+        elif action == "scroll":
+            step = self.visible_rows() if unit == "pages" else 1
+            self.scroll_rows(int(amount) * step)
+
+    def on_mouse_wheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
@@ -0,0 +1,148 @@
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ProgramImage import ProgramImage
+from SerialCommunicator import SerialCommunicator, ComException, get_available_ports
+
+MAX_WORKERS = 32    # Limite de portas transmitindo ao mesmo tempo (uma thread por porta)
+
+class FlashReport:
+    """Resultado do envio para uma porta."""
+
+    def __init__(self, port):
+        self.port = port
+        self.ok = False
+        self.cancelled = False
+        self.attempts = 0
+        self.seconds = 0.0
+        self.error = None       # Mensagem da última falha
+
+    def __str__(self):
+        if self.ok:
+            status = "OK"
+        elif self.cancelled:
+            status = "CANCELADO"
+        else:
+            status = f"FALHA ({self.error})"
+        return f"{self.port}: {status} em {self.seconds:.2f} s, {self.attempts} tentativa(s)"
+
+class MultiFlasher:
+    """
+    Envio da mesma imagem para várias placas ao mesmo tempo.
+
+    A imagem é codificada uma única vez; cada porta é atendida por uma thread
+    de um pool limitado, que reenvia o mesmo buffer, com novas tentativas em
+    caso de falha e relatório independente por porta.
+    """
+
+    def __init__(self, ports, baudrate=9600, mode=SerialCommunicator.MODE_BULK,
+                 protocol=SerialCommunicator.PROTOCOL_WORD, max_workers=None, retries=2, retry_delay=0.5):
+        """
+        :param ports: Portas de destino
+        :param max_workers: Máximo de portas transmitindo simultaneamente
+                            (padrão: todas, até MAX_WORKERS)
+        :param retries: Novas tentativas por porta após uma falha
+        :param retry_delay: Pausa (s) antes de cada nova tentativa
+        """
+        self.ports = list(dict.fromkeys(ports))     # Sem repetições, na ordem dada
+        self.baudrate = baudrate
+        self.mode = mode
+        self.protocol = protocol
+        self.max_workers = max_workers if max_workers is not None else min(len(self.ports), MAX_WORKERS)
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+    def flash(self, image, progress=None, on_attempt=None, on_done=None, cancel_event=None):
+        """
+        Envia a imagem para todas as portas.
+
+        :param image: ProgramImage ou lista de tuplas (address, data)
+        :param progress: Função opcional progress(porta, enviados, total), chamada pelas threads de envio
+        :param on_attempt: Função opcional on_attempt(porta, tentativa)
+        :param on_done: Função opcional on_done(FlashReport), chamada ao final de cada porta
+        :param cancel_event: threading.Event opcional que interrompe todos os envios
+        :return: Lista de FlashReport, na ordem das portas
+        """
+        pairs = list(image.pairs()) if isinstance(image, ProgramImage) else list(image)
+        encoder = SerialCommunicator(None, self.baudrate, mode=self.mode, protocol=self.protocol)
+        buffer = encoder.encode_image(pairs)                # Codificado uma única vez
+        image_hash = SerialCommunicator.image_hash(pairs)
+        cancel_event = cancel_event or threading.Event()
+
+        def flash_port(port):
+            report = FlashReport(port)
+            communicator = SerialCommunicator(port, self.baudrate, mode=self.mode, protocol=self.protocol)
+            port_progress = (lambda sent, total: progress(port, sent, total)) if progress else None
+            start = time.perf_counter()
+
+            while report.attempts <= self.retries and not cancel_event.is_set():
+                if report.attempts:
+                    cancel_event.wait(self.retry_delay)
+                    if cancel_event.is_set():
+                        break
+                report.attempts += 1
+                if on_attempt is not None:
+                    on_attempt(port, report.attempts)
+                try:
+                    if communicator.send_serial_data(buffer, port_progress, cancel_event):
+                        report.ok = True
+                        communicator.remember_sent_image(pairs, image_hash)
+                    break
+                except ComException as e:
+                    report.error = str(e)
+                except Exception as e:
+                    # Falha inesperada: encerra só esta porta, sem novas tentativas
+                    report.error = f"{type(e).__name__}: {e}"
+                    break
+
+            report.cancelled = not report.ok and cancel_event.is_set()
+            report.seconds = time.perf_counter() - start
+            if on_done is not None:
+                on_done(report)
+            return report
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(self.ports)))) as executor:
+            return list(executor.map(flash_port, self.ports))
+
+def main(argv=None):
+    from AssemblerCore import AssemblerCore
+
+    parser = argparse.ArgumentParser(description="BIP-ACE: envio de um programa para várias placas")
+    parser.add_argument("source", help="Arquivo .asm")
+    parser.add_argument("ports", nargs="*", help="Portas de destino")
+    parser.add_argument("--all", action="store_true", help="Envia para todas as portas detectadas")
+    parser.add_argument("--baud", type=int, default=9600)
+    parser.add_argument("--byte", action="store_true", help="Envio byte a byte (padrão: em bloco)")
+    parser.add_argument("--burst", action="store_true", help="Protocolo em rajada")
+    parser.add_argument("-j", "--jobs", type=int, help=f"Máximo de portas simultâneas (padrão: todas, até {MAX_WORKERS})")
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--isa", default="./configs/default_isa.json")
+    args = parser.parse_args(argv)
+
+    ports = get_available_ports() if args.all else args.ports
+    if not ports:
+        print("Nenhuma porta informada ou detectada.", file=sys.stderr)
+        return 1
+
+    result = AssemblerCore(AssemblerCore.load_isa(args.isa)).assemble_file(args.source)
+    if not result.ok:
+        for error in result.errors:
+            print(error, file=sys.stderr)
+        return 1
+
+    flasher = MultiFlasher(
+        ports, args.baud,
+        mode=SerialCommunicator.MODE_BYTE if args.byte else SerialCommunicator.MODE_BULK,
+        protocol=SerialCommunicator.PROTOCOL_BURST if args.burst else SerialCommunicator.PROTOCOL_WORD,
+        max_workers=args.jobs, retries=args.retries,
+    )
+    start = time.perf_counter()
+    reports = flasher.flash(result.image, on_done=lambda report: print(report, flush=True))
+    failures = sum(1 for report in reports if not report.ok)
+    print(f"\n{len(reports)} placa(s), {failures} com falha, em {time.perf_counter() - start:.2f} s")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
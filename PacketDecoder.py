@@ -0,0 +1,116 @@
+import struct
+import sys
+from array import array
+
+class PacketDecoder:
+    """
+    Receptor de referência, em Python puro, do carregador UART da BIP-FPGA.
+
+    Decodifica incrementalmente os dois protocolos de envio:
+      - palavra:  0x0 (4 bits) | address (12 bits) | data (16 bits)
+      - rajada:   0x1 (4 bits) | start address (12 bits) | count (16 bits),
+                  seguido de count palavras de 16 bits
+    e o marcador EOT (0xF0000000), que encerra uma transmissão.
+    A memória é preservada entre transmissões, como na placa.
+    """
+
+    WORD = 0x0
+    BURST = 0x1
+    EOT = 0xF
+
+    def __init__(self, memory_size=2**12, on_eot=None):
+        """
+        :param memory_size: Tamanho da memória de programa (palavras)
+        :param on_eot: Função opcional chamada a cada EOT, durante feed()
+        """
+        self.on_eot = on_eot
+        self.memory = array('H', bytes(2 * memory_size))
+        self.buffer = bytearray()
+        self.burst_address = 0      # Próximo endereço da rajada em andamento
+        self.burst_remaining = 0    # Palavras restantes da rajada em andamento
+
+        # Estatísticas
+        self.bytes_received = 0
+        self.bytes_decoded = 0      # Bytes já interpretados (no EOT: fim exato da transmissão)
+        self.word_packets = 0
+        self.bursts = 0
+        self.words_written = 0
+        self.transfers = 0          # Quantidade de EOTs recebidos
+        self.high_water = 0         # Maior endereço já escrito + 1
+
+    def feed(self, data):
+        """
+        Processa bytes recebidos (em qualquer fragmentação).
+
+        :return: Quantidade de transmissões concluídas (EOT) neste trecho.
+        """
+        self.buffer += data
+        self.bytes_received += len(data)
+        buffer = self.buffer
+        offset = 0
+        completed = 0
+
+        while True:
+            if self.burst_remaining:
+                count = min(self.burst_remaining, (len(buffer) - offset) // 2)
+                if not count:
+                    break
+                self._store_words(self.burst_address, buffer[offset:offset + 2 * count])
+                offset += 2 * count
+                self.burst_address += count
+                self.burst_remaining -= count
+                continue
+
+            if len(buffer) - offset < 4:
+                break
+
+            (header,) = struct.unpack_from(">I", buffer, offset)
+            offset += 4
+            kind = header >> 28
+            address = (header >> 16) & 0xFFF
+            value = header & 0xFFFF
+
+            if kind == self.WORD:
+                self._check_range(address, 1, offset)
+                self.memory[address] = value
+                self.high_water = max(self.high_water, address + 1)
+                self.word_packets += 1
+                self.words_written += 1
+            elif kind == self.BURST:
+                self._check_range(address, value, offset)
+                self.burst_address = address
+                self.burst_remaining = value
+                self.bursts += 1
+            elif kind == self.EOT:
+                self.transfers += 1
+                completed += 1
+                if self.on_eot is not None:
+                    self.bytes_decoded = self.bytes_received - (len(buffer) - offset)
+                    self.on_eot()
+            else:
+                del buffer[:offset]
+                raise ValueError(f"Cabeçalho de pacote desconhecido: 0x{header:08X}")
+
+        del buffer[:offset]
+        self.bytes_decoded = self.bytes_received - len(buffer)
+        return completed
+
+    def _check_range(self, address, count, offset):
+        """Valida a escrita; se inválida, descarta o buffer até o fim do cabeçalho (offset) antes de falhar."""
+        if address + count > len(self.memory):
+            del self.buffer[:offset]
+            raise ValueError(f"Escrita em {address}+{count} fora da memória de {len(self.memory)} palavras!")
+
+    def _store_words(self, address, raw):
+        """Grava palavras de 16 bits big-endian a partir de um endereço."""
+        words = array('H')
+        words.frombytes(bytes(raw))
+        if sys.byteorder == "little":
+            words.byteswap()
+        self.memory[address:address + len(words)] = words
+        self.high_water = max(self.high_water, address + len(words))
+        self.words_written += len(words)
+
+    def image(self, length=None):
+        """Retorna as primeiras length palavras da memória (padrão: até o maior endereço escrito)."""
+        return self.memory[:self.high_water if length is None else length]
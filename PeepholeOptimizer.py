@@ -0,0 +1,152 @@
+JUMPS = ("JUMP", "JNE", "JL", "JG")
+TERMINATORS = ("HLT", "JUMP")   # Instruções após as quais o fluxo não continua
+
+class OptimizationReport:
+    """Resultado da otimização de um programa: palavras e ciclos estimados economizados."""
+
+    def __init__(self, words_before):
+        self.words_before = words_before
+        self.words_after = words_before
+        self.cycles_saved = 0       # Estimativa: ciclos economizados por execução de cada trecho otimizado
+        self.skipped = None         # Motivo, se a otimização não pôde ser aplicada
+        self.rules = {"nop": 0, "redundant_ld": 0, "folded_immediates": 0, "threaded_jumps": 0, "unreachable": 0}
+
+    @property
+    def words_saved(self):
+        return self.words_before - self.words_after
+
+    def __str__(self):
+        if self.skipped:
+            return f"otimização não aplicada: {self.skipped}"
+        applied = ", ".join(f"{rule}={count}" for rule, count in self.rules.items() if count) or "nenhuma"
+        return (f"{self.words_before} -> {self.words_after} palavras ({self.words_saved} a menos), "
+                f"~{self.cycles_saved} ciclo(s) economizado(s) [{applied}]")
+
+def operand_key(operand):
+    """Normaliza um operando para comparação (0007 e 7 são o mesmo endereço)."""
+    return int(operand) if operand is not None and operand.isdigit() else operand
+
+def is_instruction(statement, *names):
+    return statement[1] is None and statement[2] in names
+
+def optimize(statements):
+    """
+    Otimização peephole sobre as instruções tokenizadas (ver AssemblerCore.tokenize),
+    antes da resolução dos rótulos e da codificação:
+
+    - remove NOP
+    - remove LD X logo após STO X (o ACC já contém o valor)
+    - agrupa ADDI/SUBI consecutivos em uma única instrução (ou nenhuma)
+    - encadeia saltos para um JUMP diretamente ao destino final
+    - remove código inalcançável após HLT/JUMP (até o próximo rótulo)
+
+    Rótulos entre duas instruções impedem as regras que as combinam, pois
+    indicam um possível destino de salto.
+
+    :param statements: Lista de (linha, rótulo, instrução, operando)
+    :return: (lista otimizada, OptimizationReport)
+    """
+    statements = list(statements)
+    report = OptimizationReport(sum(1 for statement in statements if statement[1] is None))
+
+    # Saltos para endereços numéricos deixariam de apontar para a instrução certa
+    numeric = [statement[0] for statement in statements
+               if is_instruction(statement, *JUMPS) and statement[3] is not None and statement[3].isdigit()]
+    if numeric:
+        report.skipped = f"salto para endereço numérico na linha {numeric[0]}"
+        return statements, report
+
+    changed = True
+    while changed:
+        changed = False
+        output = []
+        reachable = True
+        for statement in statements:
+            line_number, label, instr, operand = statement
+            if label is not None:
+                reachable = True    # Rótulo: possível destino de salto
+                output.append(statement)
+                continue
+
+            if not reachable:
+                report.rules["unreachable"] += 1
+                changed = True
+                continue
+
+            previous = output[-1] if output else None
+
+            if instr == "NOP":
+                report.rules["nop"] += 1
+                report.cycles_saved += 1
+                changed = True
+                continue
+
+            if (instr == "LD" and previous is not None and is_instruction(previous, "STO")
+                    and operand_key(previous[3]) == operand_key(operand)):
+                report.rules["redundant_ld"] += 1
+                report.cycles_saved += 1
+                changed = True
+                continue
+
+            if (instr in ("ADDI", "SUBI") and previous is not None and is_instruction(previous, "ADDI", "SUBI")
+                    and operand is not None and operand.isdigit() and previous[3] is not None and previous[3].isdigit()):
+                net = (int(previous[3]) if previous[2] == "ADDI" else -int(previous[3])) + \
+                      (int(operand) if instr == "ADDI" else -int(operand))
+                if net == 0:
+                    output.pop()
+                    report.rules["folded_immediates"] += 1
+                    report.cycles_saved += 2
+                    changed = True
+                    continue
+                if abs(net) < 2**12:
+                    output[-1] = (previous[0], None, "ADDI" if net > 0 else "SUBI", str(abs(net)))
+                    report.rules["folded_immediates"] += 1
+                    report.cycles_saved += 1
+                    changed = True
+                    continue
+
+            output.append(statement)
+            if instr in TERMINATORS:
+                reachable = False
+
+        statements = output
+        changed |= thread_jumps(statements, report)
+
+    report.words_after = sum(1 for statement in statements if statement[1] is None)
+    return statements, report
+
+def thread_jumps(statements, report):
+    """Redireciona saltos cujo destino é um JUMP para o destino final. Retorna se houve mudança."""
+    # Rótulo -> primeira instrução após a sua (última) definição
+    targets = {}
+    pending = []
+    for statement in statements:
+        if statement[1] is not None:
+            pending.append(statement[1])
+        else:
+            for label in pending:
+                targets[label] = statement
+            pending.clear()
+
+    defined = {statement[1] for statement in statements if statement[1] is not None}
+    changed = False
+    for index, statement in enumerate(statements):
+        if not is_instruction(statement, *JUMPS):
+            continue
+        label = statement[3]
+        visited = {label}
+        while True:
+            target = targets.get(label)
+            if target is None or not is_instruction(target, "JUMP") or target[3] not in defined:
+                break   # Um destino indefinido ficaria com o erro no salto original
+            if target[3] in visited:
+                label = statement[3]    # Laço de JUMPs: mantém o salto original
+                break
+            label = target[3]
+            visited.add(label)
+        if label != statement[3]:
+            statements[index] = (statement[0], None, statement[2], label)
+            report.rules["threaded_jumps"] += 1
+            report.cycles_saved += 1
+            changed = True
+    return changed
@@ -0,0 +1,59 @@
+import sys
+from array import array
+
+class ProgramImage:
+    """
+    Imagem de programa montada: palavras de 16 bits em um array('H'),
+    com o mapa endereço -> linha do código-fonte.
+    """
+
+    ADDRESS_SPACE = 2**12  # Endereços de 12 bits
+
+    def __init__(self, words=(), source_lines=()):
+        self.words = array('H', words)
+        self.source_lines = array('I', source_lines)
+
+    def append(self, word, source_line=0):
+        """Adiciona uma palavra ao final da imagem."""
+        self.words.append(word)
+        self.source_lines.append(source_line)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __eq__(self, other):
+        return isinstance(other, ProgramImage) and self.words == other.words
+
+    def pairs(self):
+        """Itera sobre as tuplas (address, data) da imagem."""
+        return enumerate(self.words)
+
+    def source_line(self, address):
+        """Retorna a linha do código-fonte que gerou a palavra no endereço."""
+        return self.source_lines[address]
+
+    def to_bin(self):
+        """Conteúdo de um arquivo .bin (palavras de 16 bits, big-endian)."""
+        if sys.byteorder == "big":
+            return self.words.tobytes()
+        swapped = array('H', self.words)
+        swapped.byteswap()
+        return swapped.tobytes()
+
+    def to_cdm(self):
+        """Conteúdo de um arquivo .cdm (Cedar Logic Memory File)."""
+        return "\n".join(f"{address:X} : {word:04X}" for address, word in enumerate(self.words))
+
+    def to_map(self):
+        """Mapa de fonte compacto: uma linha 'endereço : linha' por sequência de linhas consecutivas."""
+        entries = []
+        previous = None
+        for address, line in enumerate(self.source_lines):
+            if previous is None or line != previous + 1:
+                entries.append(f"{address:X} : {line}")
+            previous = line
+        return "\n".join(entries)
+
+    def listing(self):
+        """Linhas 'endereço: instrução' em binário, para exibição."""
+        return [f"{address:016b}: {word:016b}" for address, word in enumerate(self.words)]
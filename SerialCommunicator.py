@@ -1,6 +1,12 @@
+import hashlib
+import os
 import serial
+import serial.tools.list_ports
 import struct
+import threading
 import time
+import Tracing
+from ProgramImage import ProgramImage
 
 class ComException(Exception):
     """
@@ -19,13 +25,55 @@ class ComException(Exception):
             details += f" | Baudrate: {self.baudrate}"
         return details
 
+def get_available_ports():
+    ports = serial.tools.list_ports.comports()
+    # Portas extras (ex.: placas virtuais em pty do VirtualBoard), separadas por os.pathsep
+    virtual_ports = [port for port in os.environ.get("BIP_ACE_VIRTUAL_PORTS", "").split(os.pathsep) if port]
+    return [port.device for port in ports] + virtual_ports
+
 class SerialCommunicator:
     
     EOT = 0xF0000000
 
-    def __init__(self, port, baudrate=9600):
+    MODE_BYTE = "byte"  # Um byte por escrita, com pausa de dois tempos de caractere
+    MODE_BULK = "bulk"  # Pacotes em um único buffer, escritos em blocos
+
+    PROTOCOL_WORD = "word"    # Um pacote 0x0 | addr12 | data16 por palavra (padrão)
+    PROTOCOL_BURST = "burst"  # Cabeçalho 0x1 | addr12 | count16 seguido de count palavras de 16 bits
+
+    BURST = 0x1  # Nibble de cabeçalho do protocolo em rajada
+
+    # Última imagem enviada com sucesso por porta: {porta: (hash, {endereço: dado})}
+    sent_images = {}
+    sent_images_lock = threading.Lock()
+
+    def __init__(self, port, baudrate=9600, mode=MODE_BYTE, chunk_size=256, packet_gap=0.0, protocol=PROTOCOL_WORD):
+        """
+        :param mode: MODE_BYTE (padrão) ou MODE_BULK
+        :param chunk_size: Tamanho (bytes) de cada escrita no modo em bloco
+        :param packet_gap: Pausa (s) entre pacotes no modo em bloco; 0 envia sem pausas
+        :param protocol: PROTOCOL_WORD (padrão) ou PROTOCOL_BURST
+        """
         self.port = port
         self.baudrate = baudrate
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.packet_gap = packet_gap
+        self.protocol = protocol
+
+    def char_time(self):
+        """Tempo (s) de transmissão de um caractere (8N1 = 10 bits)."""
+        return 10 / self.baudrate
+
+    @staticmethod
+    def pack_packets(packets):
+        """
+        Empacota os pacotes de 32 bits em um único buffer big-endian.
+        Um fluxo já codificado (bytes, ex.: protocolo em rajada) é mantido como está.
+        """
+        if isinstance(packets, (bytes, bytearray, memoryview)):
+            return bytes(packets)
+        return struct.pack(f">{len(packets)}I", *packets)
 
     def generate_data_packet(self, address_data_pairs):
         """
@@ -50,34 +98,236 @@ class SerialCommunicator:
         packets.append(self.EOT)
         return packets
 
-    def send_serial_data(self, packets):
+    def generate_burst_stream(self, address_data_pairs):
         """
-        Envia os pacotes de 32 bits via Serial (UART).
+        Gera o fluxo do protocolo em rajada: cada trecho de endereços
+        contíguos vira um cabeçalho de 32 bits
+        0x1 (4 bits) | start address (12 bits) | count (16 bits)
+        seguido de count palavras de 16 bits, e o fluxo termina com EOT.
+        Palavras isoladas usam o pacote padrão (0x0), que é mais curto.
 
-        :param packets: Lista de pacotes de 32 bits para enviar
+        :param address_data_pairs: Lista de tuplas (address, data) com valores inteiros.
+        :return: bytes prontos para envio.
         """
-        try:
+        stream = bytearray()
+        run_start = None
+        run = []
+
+        def flush_run():
+            if len(run) == 1:
+                stream.extend(struct.pack(">I", (run_start << 16) | run[0]))
+            elif run:
+                stream.extend(struct.pack(">I", (self.BURST << 28) | (run_start << 16) | len(run)))
+                stream.extend(struct.pack(f">{len(run)}H", *run))
+
+        for address, data in address_data_pairs:
+            if not (0 <= address < 2**12):
+                raise ValueError(f"Endereço {address} fora do intervalo de 12 bits!")
+            if not (0 <= data < 2**16):
+                raise ValueError(f"Dado {data} fora do intervalo de 16 bits!")
+
+            if run and address == run_start + len(run):
+                run.append(data)
+            else:
+                flush_run()
+                run_start, run = address, [data]
+
+        flush_run()
+        stream.extend(struct.pack(">I", self.EOT))
+        return bytes(stream)
+
+    def generate_image_packets(self, image):
+        """
+        Gera os pacotes de 32 bits diretamente a partir de uma ProgramImage,
+        sem conversões intermediárias para string.
+
+        :param image: ProgramImage montada.
+        :return: Lista representando os pacotes de 32 bits (terminada com EOT).
+        """
+        if len(image) > ProgramImage.ADDRESS_SPACE:
+            raise ValueError(f"Imagem com {len(image)} palavras excede o espaço de 12 bits!")
+
+        packets = [(address << 16) | data for address, data in enumerate(image.words)]
+        packets.append(self.EOT)
+        return packets
 
-            with serial.Serial(self.port, self.baudrate, timeout=1) as ser:
-                send_serial_data_period = 10 * 1 / self.baudrate
-                send_serial_data_period *= 2
+    def send_serial_data(self, packets, progress=None, cancel_event=None):
+        """
+        Envia os pacotes de 32 bits via Serial (UART), abrindo a porta uma única vez.
 
-                #print(f"Enviando dados para {self.port} a {self.baudrate} baud...")
+        :param packets: Lista de pacotes de 32 bits, ou fluxo já codificado (bytes)
+        :param progress: Função opcional chamada como progress(enviados, total) durante o envio,
+                         em unidades de 4 bytes (pacotes, no protocolo padrão)
+        :param cancel_event: threading.Event opcional; quando sinalizado, interrompe o envio
+        :return: True se todos os pacotes foram enviados, False se cancelado
+        """
+        # Tempo limite de escrita: folga sobre o tempo de linha de um bloco
+        write_timeout = 4 * max(self.chunk_size, 4) * self.char_time() + 1
 
-                for packet in packets:
-                    data_bytes = struct.pack(">I", packet)
-                    for byte in data_bytes:
-                        ser.write(bytes([byte]))
-                        #print(f"Enviado byte: 0x{byte:02X}")
-                        time.sleep(send_serial_data_period)
+        trace = Tracing.span("serial.send", port=self.port, baudrate=self.baudrate, mode=self.mode,
+                             protocol=self.protocol)
 
-                #print("Transmissão concluída.")
+        try:
+
+            with trace, serial.Serial(self.port, self.baudrate, timeout=1, write_timeout=write_timeout) as ser:
+                if self.mode == self.MODE_BULK:
+                    return self._send_bulk(ser, packets, progress, cancel_event, trace)
+                return self._send_bytes(ser, packets, progress, cancel_event, trace)
+
+        except serial.SerialTimeoutException:
+
+            raise ComException("Tempo limite de escrita esgotado", self.port, self.baudrate)
 
         except serial.SerialException as e:
 
-            print(f"Erro ao abrir a porta serial: {e}")
+            Tracing.event("serial.error", port=self.port, error=str(e))
             raise ComException(f"Erro ao abrir a porta serial: {self.port}")
 
-    def assemble_and_send(self, address_data_pairs):
-        packets = self.generate_data_packet(address_data_pairs)
-        self.send_serial_data(packets)
+    @staticmethod
+    def trace_transfer(trace, start, sent_bytes, completed, stalls=0):
+        """Completa o span da transmissão com os bytes enviados, a vazão e as pausas."""
+        elapsed = time.perf_counter() - start
+        trace.set(bytes=sent_bytes, seconds=elapsed, bytes_per_s=sent_bytes / elapsed if elapsed > 0 else 0.0,
+                  stalls=stalls, completed=completed)
+
+    def _send_bytes(self, ser, packets, progress, cancel_event, trace=Tracing.NULL_SPAN):
+        """Modo original: um byte por escrita, com pausa de dois tempos de caractere."""
+        send_serial_data_period = 2 * self.char_time()
+        start = time.perf_counter()
+
+        buffer = self.pack_packets(packets)
+        total = (len(buffer) + 3) // 4
+        for sent, offset in enumerate(range(0, len(buffer), 4), start=1):
+            if cancel_event is not None and cancel_event.is_set():
+                self.trace_transfer(trace, start, offset, False)
+                return False
+
+            data_bytes = buffer[offset:offset + 4]
+            for byte in data_bytes:
+                ser.write(bytes([byte]))
+                time.sleep(send_serial_data_period)
+
+            if progress is not None:
+                progress(sent, total)
+
+        self.trace_transfer(trace, start, len(buffer), True)
+        return True
+
+    def _send_bulk(self, ser, packets, progress, cancel_event, trace=Tracing.NULL_SPAN):
+        """
+        Modo em bloco: todos os pacotes em um buffer, escritos em blocos.
+        O ritmo é dado pela própria UART (out_waiting/flush), e não por pausas fixas.
+        """
+        start = time.perf_counter()
+        stalls = 0              # Esperas pela fila de saída da UART
+        buffer = memoryview(self.pack_packets(packets))
+        total = (len(buffer) + 3) // 4
+
+        # Com pausa entre pacotes, cada escrita leva exatamente um pacote
+        chunk_bytes = 4 if self.packet_gap > 0 else max(4, self.chunk_size - self.chunk_size % 4)
+
+        for offset in range(0, len(buffer), chunk_bytes):
+            if cancel_event is not None and cancel_event.is_set():
+                self.trace_transfer(trace, start, offset, False, stalls)
+                return False
+
+            ser.write(buffer[offset:offset + chunk_bytes])
+
+            if self.packet_gap > 0:
+                ser.flush()  # Aguarda o pacote sair da linha antes da pausa
+                time.sleep(self.packet_gap)
+            else:
+                # Mantém no máximo um bloco na fila de saída (progresso e cancelamento precisos)
+                while ser.out_waiting > chunk_bytes:
+                    stalls += 1
+                    time.sleep((ser.out_waiting - chunk_bytes) * self.char_time())
+
+            if progress is not None:
+                progress(min(total, (offset + chunk_bytes + 3) // 4), total)
+
+        ser.flush()
+        self.trace_transfer(trace, start, len(buffer), True, stalls)
+        return True
+
+    @staticmethod
+    def image_hash(address_data_pairs):
+        """Hash (SHA-1) de uma sequência de tuplas (address, data)."""
+        digest = hashlib.sha1()
+        for address, data in address_data_pairs:
+            digest.update(struct.pack(">HH", address, data))
+        return digest.hexdigest()
+
+    def changed_pairs(self, address_data_pairs, image_hash):
+        """
+        Retorna apenas as tuplas (address, data) que diferem da última imagem
+        enviada com sucesso para esta porta (todas, se não houver cache).
+        """
+        with self.sent_images_lock:
+            cached = self.sent_images.get(self.port)
+
+        if cached is None:
+            return list(address_data_pairs)
+
+        cached_hash, cached_memory = cached
+        if cached_hash == image_hash:
+            return []
+        return [(address, data) for address, data in address_data_pairs if cached_memory.get(address) != data]
+
+    def forget_sent_image(self):
+        """Descarta o cache desta porta (ex.: após reiniciar a placa)."""
+        with self.sent_images_lock:
+            self.sent_images.pop(self.port, None)
+
+    def assemble_and_send(self, address_data_pairs, differential=False, force_full=False,
+                          progress=None, cancel_event=None):
+        """
+        Gera os pacotes e envia a imagem.
+
+        :param address_data_pairs: ProgramImage ou lista de tuplas (address, data)
+        :param differential: Envia apenas as palavras alteradas desde o último envio para a porta (mais EOT)
+        :param force_full: Ignora o cache e reenvia a imagem completa
+        :return: True se o envio foi concluído, False se cancelado
+        """
+        if isinstance(address_data_pairs, ProgramImage):
+            pairs = list(address_data_pairs.pairs())
+        else:
+            pairs = list(address_data_pairs)
+
+        image_hash = self.image_hash(pairs)
+
+        if differential and not force_full:
+            pairs_to_send = self.changed_pairs(pairs, image_hash)
+        else:
+            pairs_to_send = pairs
+
+        with Tracing.span("packets", protocol=self.protocol, words=len(pairs_to_send),
+                          differential=pairs_to_send is not pairs):
+            if self.protocol == self.PROTOCOL_BURST:
+                packets = self.generate_burst_stream(pairs_to_send)
+            elif pairs_to_send is pairs and isinstance(address_data_pairs, ProgramImage):
+                packets = self.generate_image_packets(address_data_pairs)
+            else:
+                packets = self.generate_data_packet(pairs_to_send)
+
+        completed = self.send_serial_data(packets, progress, cancel_event)
+
+        if completed:
+            self.remember_sent_image(pairs, image_hash)
+        return completed
+
+    def remember_sent_image(self, address_data_pairs, image_hash):
+        """Registra a imagem enviada com sucesso para esta porta (base do envio diferencial)."""
+        with self.sent_images_lock:
+            self.sent_images[self.port] = (image_hash, dict(address_data_pairs))
+
+    def encode_image(self, address_data_pairs):
+        """
+        Codifica a imagem completa, no protocolo configurado, em um único buffer.
+        O buffer (imutável) pode ser reenviado a várias portas com send_serial_data.
+
+        :return: bytes prontos para envio
+        """
+        with Tracing.span("packets", protocol=self.protocol, words=len(address_data_pairs)):
+            if self.protocol == self.PROTOCOL_BURST:
+                return self.generate_burst_stream(address_data_pairs)
+            return self.pack_packets(self.generate_data_packet(address_data_pairs))
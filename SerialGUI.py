@@ -1,17 +1,50 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import serial.tools.list_ports
-from SerialCommunicator import SerialCommunicator, ComException
+import queue
+import threading
+from SerialCommunicator import SerialCommunicator, ComException, get_available_ports
+from MultiFlasher import MultiFlasher, MAX_WORKERS
 
-def get_available_ports():
-    ports = serial.tools.list_ports.comports()
-    return [port.device for port in ports]
+class UploadWorker(threading.Thread):
+    """
+    Thread que transmite a imagem por uma única conexão serial e
+    reporta progresso, conclusão e erros pela fila de eventos.
+    """
+
+    def __init__(self, communicator, image, events, differential=False):
+        super().__init__(daemon=True)
+        self.communicator = communicator
+        self.image = image
+        self.events = events
+        self.differential = differential
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            completed = self.communicator.assemble_and_send(
+                self.image,
+                differential=self.differential,
+                progress=lambda sent, total: self.events.put(("progress", sent, total)),
+                cancel_event=self.cancel_event,
+            )
+            self.events.put(("done", completed))
+        except (ComException, ValueError) as e:
+            self.events.put(("error", str(e)))
+        except Exception as e:     # Sem o evento, a janela ficaria em "Enviando..." indefinidamente
+            self.events.put(("error", f"{type(e).__name__}: {e}"))
 
 class SerialGUI:
 
-    def __init__(self, root, data_pairs):
+    POLL_INTERVAL = 50  # Intervalo (ms) de leitura da fila de eventos do envio
+
+    def __init__(self, root, image):
 
         self.root = root
+        self.worker = None
+        self.events = queue.Queue()
 
         available_ports = get_available_ports()
 
@@ -21,11 +54,13 @@ class SerialGUI:
 
         serial_window = tk.Toplevel(self.root)
         serial_window.title("Serial")
-        serial_window.geometry("300x275")
+        serial_window.geometry("300x430")
         serial_window.resizable(False, False)
+        serial_window.protocol("WM_DELETE_WINDOW", self.close)
+        self.serial_window = serial_window
 
         serial_window.configure(bg='#f0f0f0')
-        self.data_pairs = data_pairs
+        self.image = image
 
         # Bloqueia a interação com a janela principal
         serial_window.grab_set()
@@ -43,15 +78,37 @@ class SerialGUI:
         self.baudrate_entry.insert(0, "9600")
         self.baudrate_entry.pack(pady=5)
 
-        self.send_button = ttk.Button(serial_window, text="Enviar", command=self.send_data)
-        self.send_button.pack(pady=10)
+        self.bulk_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(serial_window, text="Envio em bloco", variable=self.bulk_var).pack(pady=2)
+
+        # Desmarcado, força o reenvio da imagem completa
+        self.differential_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(serial_window, text="Enviar apenas alterações", variable=self.differential_var).pack(pady=2)
+
+        # Requer um carregador na placa com suporte ao cabeçalho 0x1
+        self.burst_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(serial_window, text="Protocolo em rajada", variable=self.burst_var).pack(pady=2)
+
+        button_frame = ttk.Frame(serial_window)
+        button_frame.pack(pady=10)
+
+        self.send_button = ttk.Button(button_frame, text="Enviar", command=self.send_data)
+        self.send_button.pack(side=tk.LEFT, padx=5)
+
+        self.cancel_button = ttk.Button(button_frame, text="Cancelar", command=self.cancel_upload, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
 
         self.progress = ttk.Progressbar(serial_window, orient="horizontal", length=200, mode='determinate')
         self.progress.pack(pady=10)
 
+        self.status_label = ttk.Label(serial_window, text="")
+        self.status_label.pack()
+
+        ttk.Button(serial_window, text="Várias placas...", command=self.open_multi_flash).pack(pady=5)
+
         # Garante que a janela fique no topo
         serial_window.grab_set()
-        serial_window.wait_window() 
+        serial_window.wait_window()
 
 
     def send_data(self):
@@ -63,30 +120,263 @@ class SerialGUI:
             messagebox.showerror("Erro", "Baud rate inválido!")
             return
 
-        address_data_pairs = self.data_pairs
-
         if not port:
             messagebox.showerror("Erro", "Porta serial não especificada!")
             return
 
         try:
 
-            communicator = SerialCommunicator(port, baudrate)
+            mode = SerialCommunicator.MODE_BULK if self.bulk_var.get() else SerialCommunicator.MODE_BYTE
+            protocol = SerialCommunicator.PROTOCOL_BURST if self.burst_var.get() else SerialCommunicator.PROTOCOL_WORD
+            communicator = SerialCommunicator(port, baudrate, mode=mode, protocol=protocol)
 
         except ComException as e:
-            
+
             messagebox.showerror("Erro", f"Erro ao abrir a porta serial: {e}")
             return
 
-        packets = communicator.generate_data_packet(address_data_pairs)
-
         self.progress['value'] = 0
-        step = 100 / len(packets)
+        self.status_label.config(text="Enviando...")
+        self.send_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+
+        # A transmissão roda em segundo plano; a janela apenas consome a fila de eventos
+        self.worker = UploadWorker(communicator, self.image, self.events, self.differential_var.get())
+        self.worker.start()
+        self.serial_window.after(self.POLL_INTERVAL, self.poll_events)
+
+    def poll_events(self):
+        """Consome os eventos do envio no laço do Tk."""
+        if not self.serial_window.winfo_exists():
+            return  # Janela fechada; o envio já foi cancelado
+
+        finished = False
+
+        try:
+            while True:
+                event = self.events.get_nowait()
+                if event[0] == "progress":
+                    _, sent, total = event
+                    self.progress['maximum'] = total
+                    self.progress['value'] = sent
+                    self.status_label.config(text=f"{sent}/{total} pacotes")
+                elif event[0] == "done":
+                    finished = True
+                    if event[1]:
+                        messagebox.showinfo("Concluído", "Transmissão concluída!", parent=self.serial_window)
+                    else:
+                        self.status_label.config(text="Transmissão cancelada.")
+                elif event[0] == "error":
+                    finished = True
+                    self.status_label.config(text="Falha na transmissão.")
+                    messagebox.showerror("Erro", event[1], parent=self.serial_window)
+        except queue.Empty:
+            pass
+
+        if finished:
+            self.worker = None
+            self.send_button.config(state=tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
+        else:
+            self.serial_window.after(self.POLL_INTERVAL, self.poll_events)
+
+    def cancel_upload(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.status_label.config(text="Cancelando...")
+
+    def open_multi_flash(self):
+        """Troca esta janela pela de envio simultâneo para várias placas."""
+        if self.worker is not None:
+            messagebox.showerror("Erro", "Aguarde o término do envio atual.", parent=self.serial_window)
+            return
+        self.serial_window.destroy()
+        MultiFlashGUI(self.root, self.image)
+
+    def close(self):
+        """Fecha a janela, interrompendo um envio em andamento."""
+        self.cancel_upload()
+        self.serial_window.destroy()
+
+class MultiFlashGUI:
+    """
+    Janela de envio da mesma imagem para várias placas (ver MultiFlasher).
+    Cada porta tem sua linha com progresso, tentativas e situação.
+    """
+
+    POLL_INTERVAL = 50  # Intervalo (ms) de leitura da fila de eventos do envio
+
+    def __init__(self, root, image):
+
+        self.root = root
+        self.image = image
+        self.events = queue.Queue()
+        self.cancel_event = None
+        self.running = False
+
+        window = tk.Toplevel(self.root)
+        window.title("Várias placas")
+        window.geometry("520x500")
+        window.protocol("WM_DELETE_WINDOW", self.close)
+        window.configure(bg='#f0f0f0')
+        self.window = window
+
+        ttk.Label(window, text="Portas COM:").pack(pady=5)
+        self.port_list = tk.Listbox(window, selectmode=tk.EXTENDED, height=5, exportselection=False)
+        self.port_list.pack(fill=tk.X, padx=10)
+
+        port_buttons = ttk.Frame(window)
+        port_buttons.pack(pady=5)
+        ttk.Button(port_buttons, text="Selecionar todas", command=lambda: self.port_list.select_set(0, tk.END)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(port_buttons, text="Atualizar", command=self.refresh_ports).pack(side=tk.LEFT, padx=5)
+        self.refresh_ports()
+
+        options = ttk.Frame(window)
+        options.pack(pady=5)
+        ttk.Label(options, text="Baud Rate (bps):").pack(side=tk.LEFT)
+        self.baudrate_entry = ttk.Entry(options, width=10)
+        self.baudrate_entry.insert(0, "9600")
+        self.baudrate_entry.pack(side=tk.LEFT, padx=5)
+
+        self.bulk_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options, text="Envio em bloco", variable=self.bulk_var).pack(side=tk.LEFT, padx=5)
+        self.burst_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options, text="Protocolo em rajada", variable=self.burst_var).pack(side=tk.LEFT, padx=5)
+
+        workers = ttk.Frame(window)
+        workers.pack(pady=5)
+        ttk.Label(workers, text="Envios simultâneos:").pack(side=tk.LEFT)
+        self.workers_spinbox = ttk.Spinbox(workers, from_=1, to=MAX_WORKERS, width=5)
+        self.workers_spinbox.set(MAX_WORKERS)
+        self.workers_spinbox.pack(side=tk.LEFT, padx=5)
+
+        button_frame = ttk.Frame(window)
+        button_frame.pack(pady=5)
+        self.send_button = ttk.Button(button_frame, text="Enviar", command=self.send_data)
+        self.send_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(button_frame, text="Cancelar", command=self.cancel_upload, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+
+        self.table = ttk.Treeview(window, columns=("progress", "attempts", "status"), height=8)
+        self.table.heading("#0", text="Porta")
+        self.table.heading("progress", text="Progresso")
+        self.table.heading("attempts", text="Tentativas")
+        self.table.heading("status", text="Situação")
+        self.table.column("#0", width=140)
+        self.table.column("progress", width=90, anchor=tk.CENTER)
+        self.table.column("attempts", width=80, anchor=tk.CENTER)
+        self.table.column("status", width=180)
+        self.table.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        self.status_label = ttk.Label(window, text="")
+        self.status_label.pack(pady=5)
+
+        window.grab_set()
+
+    def refresh_ports(self):
+        self.port_list.delete(0, tk.END)
+        for port in get_available_ports():
+            self.port_list.insert(tk.END, port)
+
+    def send_data(self):
+        ports = [self.port_list.get(index) for index in self.port_list.curselection()]
+        if not ports:
+            messagebox.showerror("Erro", "Nenhuma porta selecionada!", parent=self.window)
+            return
+        try:
+            baudrate = int(self.baudrate_entry.get())
+        except ValueError:
+            messagebox.showerror("Erro", "Baud rate inválido!", parent=self.window)
+            return
+        try:
+            max_workers = int(self.workers_spinbox.get())
+            if max_workers < 1:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Erro", "Número de envios simultâneos inválido!", parent=self.window)
+            return
+
+        flasher = MultiFlasher(
+            ports, baudrate,
+            mode=SerialCommunicator.MODE_BULK if self.bulk_var.get() else SerialCommunicator.MODE_BYTE,
+            protocol=SerialCommunicator.PROTOCOL_BURST if self.burst_var.get() else SerialCommunicator.PROTOCOL_WORD,
+            max_workers=min(max_workers, MAX_WORKERS),
+        )
+
+        self.table.delete(*self.table.get_children())
+        for port in flasher.ports:
+            self.table.insert("", tk.END, iid=port, text=port, values=("0%", 0, "Aguardando"))
+
+        self.running = True
+        self.cancel_event = threading.Event()
+        self.status_label.config(text=f"Enviando para {len(flasher.ports)} placa(s)...")
+        self.send_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+
+        # As threads do pool apenas publicam eventos; a tabela é atualizada no laço do Tk
+        def run():
+            try:
+                reports = flasher.flash(
+                    self.image,
+                    progress=lambda port, sent, total: self.events.put(("progress", port, sent, total)),
+                    on_attempt=lambda port, attempt: self.events.put(("attempt", port, attempt)),
+                    on_done=lambda report: self.events.put(("done", report)),
+                    cancel_event=self.cancel_event,
+                )
+            except Exception as e:     # Ex.: imagem que não pode ser codificada
+                self.events.put(("failed", str(e)))
+                return
+            self.events.put(("finished", reports))
+
+        threading.Thread(target=run, daemon=True).start()
+        self.window.after(self.POLL_INTERVAL, self.poll_events)
+
+    def poll_events(self):
+        """Consome os eventos do envio no laço do Tk."""
+        if not self.window.winfo_exists():
+            return  # Janela fechada; o envio já foi cancelado
+
+        try:
+            while True:
+                event = self.events.get_nowait()
+                if event[0] == "progress":
+                    _, port, sent, total = event
+                    self.table.set(port, "progress", f"{100 * sent // total}%")
+                elif event[0] == "attempt":
+                    _, port, attempt = event
+                    self.table.set(port, "attempts", attempt)
+                    self.table.set(port, "status", "Enviando" if attempt == 1 else "Reenviando")
+                elif event[0] == "done":
+                    report = event[1]
+                    if report.ok:
+                        status = f"OK ({report.seconds:.1f} s)"
+                    elif report.cancelled:
+                        status = "Cancelado"
+                    else:
+                        status = f"Falha: {report.error}"
+                    self.table.set(report.port, "status", status)
+                elif event[0] in ("finished", "failed"):
+                    self.running = False
+                    self.send_button.config(state=tk.NORMAL)
+                    self.cancel_button.config(state=tk.DISABLED)
+                    if event[0] == "finished":
+                        failures = sum(1 for report in event[1] if not report.ok)
+                        self.status_label.config(text=f"Concluído: {len(event[1]) - failures} OK, {failures} com falha.")
+                    else:
+                        self.status_label.config(text="Falha no envio.")
+                        messagebox.showerror("Erro", event[1], parent=self.window)
+                    return
+        except queue.Empty:
+            pass
 
-        for packet in packets:
-            communicator.send_serial_data([packet])
-            self.progress['value'] += step
-            self.root.update_idletasks()
+        self.window.after(self.POLL_INTERVAL, self.poll_events)
 
-        messagebox.showinfo("Concluído", "Transmissão concluída!")
+    def cancel_upload(self):
+        if self.running:
+            self.cancel_event.set()
+            self.status_label.config(text="Cancelando...")
 
+    def close(self):
+        """Fecha a janela, interrompendo os envios em andamento."""
+        self.cancel_upload()
+        self.window.destroy()
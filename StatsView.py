@@ -0,0 +1,66 @@
+import tkinter as tk
+from tkinter import ttk
+import Tracing
+
+class StatsView:
+    """
+    Painel de estatísticas do rastreamento (ver Tracing): por span, número de
+    execuções, tempo médio, máximo e último, com os campos da última execução,
+    e os contadores de eventos. Atualizado periodicamente enquanto aberto.
+    """
+
+    REFRESH_INTERVAL = 500  # Intervalo (ms) de atualização da tabela
+
+    def __init__(self, root):
+        # O painel precisa dos dados: liga o rastreamento (sem registro em disco, se não configurado)
+        if not Tracing.enabled():
+            Tracing.enable()
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Estatísticas de desempenho")
+        self.window.geometry("900x400")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.table = ttk.Treeview(self.window, columns=("count", "mean", "max", "last", "details"))
+        for column, title, width, anchor in (("#0", "Span", 160, tk.W), ("count", "N", 60, tk.E),
+                                             ("mean", "Média (ms)", 90, tk.E), ("max", "Máx. (ms)", 90, tk.E),
+                                             ("last", "Último (ms)", 90, tk.E), ("details", "Última execução", 380, tk.W)):
+            self.table.heading(column, text=title)
+            self.table.column(column, width=width, anchor=anchor)
+        self.table.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+
+        bottom = ttk.Frame(self.window)
+        bottom.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ttk.Button(bottom, text="Zerar", command=Tracing.reset).pack(side=tk.LEFT)
+        self.status_label = ttk.Label(bottom, text="")
+        self.status_label.pack(side=tk.LEFT, padx=10)
+
+        self.refresh()
+
+    def refresh(self):
+        if not self.window.winfo_exists():
+            return
+
+        spans, counters = Tracing.snapshot()
+        self.table.delete(*self.table.get_children())
+        for name in sorted(spans):
+            stats = spans[name]
+            details = ", ".join(f"{key}={self.format_value(value)}" for key, value in stats["last"].items())
+            self.table.insert("", tk.END, text=name, values=(
+                stats["count"], f"{stats['total_ms'] / stats['count']:.2f}", f"{stats['max_ms']:.2f}",
+                f"{stats['last_ms']:.2f}", details))
+
+        log_path = Tracing.log_path()
+        status = f"Registro: {log_path}" if log_path else "Registro em disco desligado (BIP_ACE_TRACE)"
+        if counters:
+            status += "  |  " + ", ".join(f"{name}={value}" for name, value in sorted(counters.items()))
+        self.status_label.config(text=status)
+
+        self.window.after(self.REFRESH_INTERVAL, self.refresh)
+
+    @staticmethod
+    def format_value(value):
+        return f"{value:.3g}" if isinstance(value, float) else str(value)
+
+    def close(self):
+        self.window.destroy()
@@ -0,0 +1,156 @@
+import re
+import Tracing
+
+TAGS = ("instruction", "register", "label", "comment", "number")
+
+def build_token_pattern(instructions, registers):
+    """
+    Monta o padrão de uma única expressão regular com todos os tokens da ISA.
+
+    A ordem das alternativas define a prioridade: comentários e rótulos
+    vencem instruções, registradores e números.
+    """
+    def words(names):
+        # Nomes mais longos primeiro para evitar casamentos parciais (ex.: ADD x ADDI)
+        return "|".join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+
+    alternatives = [
+        r"(?P<comment>;.*)",
+        r"(?P<label>^[ \t]*[A-Za-z_][A-Za-z0-9_]*:)",
+    ]
+    if instructions:
+        alternatives.append(rf"(?P<instruction>\b(?:{words(instructions)})\b)")
+    if registers:
+        alternatives.append(rf"(?P<register>\b(?:{words(registers)})\b)")
+    alternatives.append(r"(?P<number>\b\d+\b)")
+
+    return "|".join(alternatives)
+
+def build_token_regex(instructions, registers):
+    """Compila o tokenizador da ISA."""
+    return re.compile(build_token_pattern(instructions, registers))
+
+def tokenize_line(regex, line):
+    """Retorna as tuplas (tag, início, fim) de uma linha."""
+    return [(match.lastgroup, match.start(), match.end()) for match in regex.finditer(line)]
+
+class SyntaxHighlighter:
+    """
+    Destaque de sintaxe incremental: re-aplica as tags apenas nas linhas
+    modificadas, agrupando rajadas de eventos em uma única passagem.
+    """
+
+    def __init__(self, text_area, token_regex, delay=30):
+        self.text_area = text_area
+        self.delay = delay          # Atraso (ms) para agrupar eventos consecutivos
+        self.regex = token_regex
+        self.dirty = None           # Intervalo de linhas pendente (primeira, última)
+        self.replaced = None        # Linhas que a próxima edição pode substituir (ver before_edit)
+        self.view_changed = False   # Desfazer/refazer: a alteração pode estar longe do cursor
+        self.after_id = None
+        self.line_count = self.total_lines()
+
+    def set_regex(self, token_regex):
+        """Troca o tokenizador (nova ISA) e re-aplica em todo o texto."""
+        self.regex = token_regex
+        self.highlight_all()
+
+    def total_lines(self):
+        return int(self.text_area.index("end-1c").split(".")[0])
+
+    def mark_dirty(self, first, last):
+        """Acrescenta um intervalo de linhas ao intervalo pendente."""
+        if self.dirty is None:
+            self.dirty = (first, last)
+        else:
+            self.dirty = (min(self.dirty[0], first), max(self.dirty[1], last))
+
+    def line_of(self, index):
+        return int(self.text_area.index(index).split(".")[0])
+
+    def before_edit(self, event=None):
+        """
+        Registra, antes de uma tecla, colagem ou recorte, as linhas que a edição
+        pode substituir: a linha do cursor e a seleção. Sem isso, substituir N
+        linhas por outras N (delta zero) re-aplicaria o destaque só na linha do cursor.
+        """
+        lines = [self.line_of("insert")]
+        if self.text_area.tag_ranges("sel"):
+            lines += [self.line_of("sel.first"), self.line_of("sel.last")]
+        self.replaced = (min(lines), max(lines))
+
+    def before_undo(self, event=None):
+        """Desfazer/refazer altera trechos em qualquer ponto: inclui as linhas visíveis após a edição."""
+        self.replaced = None    # A posição do cursor antes de desfazer não indica o trecho alterado
+        self.view_changed = True
+
+    def on_edit(self, event=None):
+        """
+        Marca as linhas afetadas pela edição (a linha do cursor, as linhas
+        inseridas ou removidas antes dela e o trecho registrado por before_edit)
+        e agenda o destaque.
+        """
+        total_lines = self.total_lines()
+        delta = total_lines - self.line_count
+        self.line_count = total_lines
+
+        cursor_line = self.line_of("insert")
+        first, last = max(1, cursor_line - max(delta, 0)), cursor_line
+        if self.replaced is not None:
+            # As linhas [início, fim] da seleção passam a ser [início, fim + delta]
+            first, last = min(first, self.replaced[0]), max(last, self.replaced[1] + delta)
+            self.replaced = None
+        if self.view_changed:
+            # O Tk rola o texto até o trecho desfeito
+            first = min(first, self.line_of("@0,0"))
+            last = max(last, self.line_of(f"@0,{self.text_area.winfo_height()}"))
+            self.view_changed = False
+
+        self.mark_dirty(first, last)
+        self.schedule()
+
+    def schedule(self):
+        """Reinicia o temporizador, agrupando eventos próximos em uma só passagem."""
+        if self.after_id is not None:
+            self.text_area.after_cancel(self.after_id)
+        self.after_id = self.text_area.after(self.delay, self.flush)
+
+    def flush(self):
+        """Aplica o destaque no intervalo pendente."""
+        self.after_id = None
+        if self.dirty is not None:
+            first, last = self.dirty
+            self.dirty = None
+            self.highlight_lines(first, min(last, self.total_lines()))
+
+    def highlight_all(self):
+        """Re-aplica o destaque em todo o texto imediatamente."""
+        if self.after_id is not None:
+            self.text_area.after_cancel(self.after_id)
+            self.after_id = None
+        self.dirty = None
+        self.line_count = self.total_lines()
+        self.highlight_lines(1, self.line_count)
+
+    def highlight_lines(self, first, last):
+        """Re-aplica as tags nas linhas [first, last]."""
+        if last < first:
+            return
+
+        with Tracing.span("highlight", lines=last - first + 1) as trace:
+            start, end = f"{first}.0", f"{last}.end"
+            for tag in TAGS:
+                self.text_area.tag_remove(tag, start, end)
+
+            ranges = {tag: [] for tag in TAGS}
+            text = self.text_area.get(start, end)
+            for line_number, line in enumerate(text.split("\n"), start=first):
+                for tag, token_start, token_end in tokenize_line(self.regex, line):
+                    ranges[tag].append(f"{line_number}.{token_start}")
+                    ranges[tag].append(f"{line_number}.{token_end}")
+
+            # Uma chamada ao Tk por tag, com todos os intervalos de uma vez
+            for tag, indices in ranges.items():
+                if indices:
+                    self.text_area.tag_add(tag, *indices)
+            trace.set(tags=sum(len(indices) for indices in ranges.values()) // 2)
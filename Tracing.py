@@ -0,0 +1,196 @@
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+
+# BIP_ACE_TRACE=1 grava o registro em <cache>/trace.jsonl; outro valor é o caminho do arquivo
+TRACE_ENV = "BIP_ACE_TRACE"
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUPS = 3
+
+class Span:
+    """
+    Trecho medido (tempo monotônico) com campos livres, usado como gerenciador de contexto:
+
+        with Tracing.span("highlight", lines=10) as s:
+            ...
+            s.set(tags=42)
+    """
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        ms = (time.perf_counter() - self.start) * 1e3
+        if exc_type is not None:
+            self.fields["error"] = f"{exc_type.__name__}: {exc}"
+        _tracer.record_span(self.name, self.start, ms, self.fields)
+        return False
+
+class NullSpan:
+    """Span sem efeito, devolvido quando o rastreamento está desligado."""
+
+    def set(self, **fields):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+NULL_SPAN = NullSpan()
+
+class Tracer:
+    """
+    Agrega spans e contadores em memória (para o painel de estatísticas) e,
+    opcionalmente, os grava em um arquivo JSON-lines com rotação.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.log_path = None
+        self.logger = None
+        self.lock = threading.Lock()
+        self.spans = {}         # Nome -> {"count", "total_ms", "max_ms", "last_ms", "last"}
+        self.counters = {}
+
+    def enable(self, log_path=None):
+        """
+        Liga o rastreamento; com log_path, também grava o registro em disco
+        (True: arquivo padrão no diretório de cache, resolvido no primeiro registro).
+        """
+        with self.lock:
+            if log_path != self.log_path:
+                self.close_log()
+                self.log_path = log_path
+            self.enabled = True
+
+    def disable(self):
+        with self.lock:
+            self.enabled = False
+            self.close_log()
+            self.log_path = None
+
+    def reset(self):
+        with self.lock:
+            self.spans.clear()
+            self.counters.clear()
+
+    def close_log(self):
+        if self.logger is not None:
+            for handler in list(self.logger.handlers):
+                self.logger.removeHandler(handler)
+                handler.close()
+            self.logger = None
+
+    def open_log(self):
+        """Abre o arquivo de registro no primeiro uso."""
+        if self.log_path is True:
+            self.log_path = default_log_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            self.log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self.logger = logging.getLogger("bip_ace.trace")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(handler)
+
+    def write(self, record):
+        """Grava um registro no arquivo (chamado com self.lock adquirido)."""
+        if self.log_path is None:
+            return
+        try:
+            if self.logger is None:
+                self.open_log()
+            self.logger.info(json.dumps(record, default=str))
+        except OSError:
+            self.log_path = None    # Registro indisponível: mantém só as estatísticas em memória
+
+    def record_span(self, name, start, ms, fields):
+        with self.lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                stats = self.spans[name] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0, "last": {}}
+            stats["count"] += 1
+            stats["total_ms"] += ms
+            stats["max_ms"] = max(stats["max_ms"], ms)
+            stats["last_ms"] = ms
+            stats["last"] = fields
+            self.write({"type": "span", "name": name, "t": start, "ms": round(ms, 3),
+                        "thread": threading.current_thread().name, **fields})
+
+    def record_event(self, name, fields):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+            self.write({"type": "event", "name": name, "t": time.perf_counter(),
+                        "thread": threading.current_thread().name, **fields})
+
+    def add(self, name, value):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self):
+        """Cópia das estatísticas: (spans, contadores)."""
+        with self.lock:
+            spans = {name: dict(stats, last=dict(stats["last"])) for name, stats in self.spans.items()}
+            return spans, dict(self.counters)
+
+_tracer = Tracer()
+
+def enabled():
+    return _tracer.enabled
+
+def span(name, **fields):
+    """Novo Span; com o rastreamento desligado, devolve NULL_SPAN (custo de uma chamada)."""
+    if not _tracer.enabled:
+        return NULL_SPAN
+    return Span(name, fields)
+
+def event(name, **fields):
+    """Registra um evento pontual (ex.: falha), contado também como contador."""
+    if _tracer.enabled:
+        _tracer.record_event(name, fields)
+
+def count(name, value=1):
+    if _tracer.enabled:
+        _tracer.add(name, value)
+
+def enable(log_path=None):
+    _tracer.enable(log_path)
+
+def disable():
+    _tracer.disable()
+
+def reset():
+    _tracer.reset()
+
+def snapshot():
+    return _tracer.snapshot()
+
+def log_path():
+    path = _tracer.log_path
+    return default_log_path() if path is True else path
+
+def default_log_path():
+    from ISACompiler import CACHE_ROOT
+    return os.path.join(CACHE_ROOT, "trace.jsonl")
+
+def enable_from_environment():
+    """Liga o rastreamento conforme BIP_ACE_TRACE (vazio ou 0: desligado)."""
+    value = os.environ.get(TRACE_ENV, "")
+    if value and value != "0":
+        enable(True if value == "1" else value)
+
+enable_from_environment()
@@ -0,0 +1,173 @@
+import argparse
+import hashlib
+import json
+import os
+import select
+import sys
+import threading
+import time
+import tty
+from PacketDecoder import PacketDecoder
+
+class VirtualBoard:
+    """
+    Placa BIP-FPGA virtual em um pseudo-terminal (Linux/macOS).
+
+    O lado escravo do pty (self.port) é usado como uma porta serial comum
+    pelo SerialCommunicator/SerialGUI. O lado mestre emula o carregador UART
+    da placa: decodifica os pacotes addr|data (e rajadas) até o EOT, consome
+    os bytes no ritmo da taxa configurada (8N1) e gera um relatório por
+    transmissão com a imagem recebida e as estatísticas de tempo.
+    """
+
+    def __init__(self, baudrate=9600, enforce_timing=True, on_transfer=None):
+        """
+        :param baudrate: Taxa (bps) emulada pela placa
+        :param enforce_timing: Consome os bytes no ritmo da linha (caso contrário, o mais rápido possível)
+        :param on_transfer: Função opcional chamada com o relatório de cada transmissão concluída
+        """
+        self.baudrate = baudrate
+        self.char_time = 10 / baudrate
+        self.enforce_timing = enforce_timing
+        self.on_transfer = on_transfer
+        self.decoder = PacketDecoder()
+        self.reports = []
+        self.error = None
+
+        self.master_fd, self.slave_fd = os.openpty()
+        tty.setraw(self.master_fd)
+        tty.setraw(self.slave_fd)
+        self.port = os.ttyname(self.slave_fd)
+
+        self.transfer_done = threading.Condition()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join(timeout=1)
+        os.close(self.master_fd)
+        os.close(self.slave_fd)
+
+    def wait_transfer(self, count=1, timeout=None):
+        """Aguarda até que count transmissões tenham sido concluídas; retorna o último relatório."""
+        with self.transfer_done:
+            self.transfer_done.wait_for(lambda: len(self.reports) >= count or self.error, timeout)
+        if self.error:
+            raise self.error
+        return self.reports[count - 1] if len(self.reports) >= count else None
+
+    def run(self):
+        """Laço do carregador UART."""
+        decoder = self.decoder
+        eot_offsets = []        # Posição (bytes decodificados) de cada EOT ainda sem relatório
+        decoder.on_eot = lambda: eot_offsets.append(decoder.bytes_decoded)
+
+        start = None            # Instante do primeiro byte da transmissão atual
+        start_offset = 0        # Bytes já recebidos antes da transmissão atual
+        idle = 0.0              # Tempo de linha ociosa durante a transmissão
+        stalls = 0              # Pausas maiores que dois tempos de caractere
+        counters = (0, 0, 0)
+
+        while not self.stop_event.is_set():
+            waiting_since = time.perf_counter()
+            ready, _, _ = select.select([self.master_fd], [], [], 0.1)
+            if not ready:
+                continue
+            try:
+                chunk = os.read(self.master_fd, 4096)
+            except OSError:
+                break
+            now = time.perf_counter()
+
+            if start is None:
+                start = now
+                counters = (decoder.word_packets, decoder.bursts, decoder.words_written)
+            else:
+                gap = now - waiting_since
+                if gap > 2 * self.char_time:
+                    stalls += 1
+                    idle += gap
+
+            try:
+                decoder.feed(chunk)
+            except ValueError as e:
+                with self.transfer_done:
+                    self.error = e
+                    self.transfer_done.notify_all()
+                return
+
+            if self.enforce_timing:
+                # A placa não consome mais rápido do que a linha transmitiria
+                delay = start + (decoder.bytes_received - start_offset) * self.char_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            for offset in eot_offsets:
+                self.finish_transfer(start, offset - start_offset, idle, stalls, counters)
+                start, start_offset, idle, stalls = time.perf_counter(), offset, 0.0, 0
+                counters = (decoder.word_packets, decoder.bursts, decoder.words_written)
+            if eot_offsets:
+                eot_offsets.clear()
+                if decoder.bytes_received == start_offset:
+                    start = None  # Nenhum byte da próxima transmissão recebido ainda
+
+    def finish_transfer(self, start, received, idle, stalls, counters):
+        elapsed = time.perf_counter() - start
+        decoder = self.decoder
+        image = decoder.image()
+        report = {
+            "transfer": decoder.transfers,
+            "bytes": received,
+            "seconds": elapsed,
+            "bytes_per_s": received / elapsed if elapsed > 0 else 0.0,
+            "line_rate_bytes_per_s": self.baudrate / 10,
+            "stalls": stalls,
+            "idle_seconds": idle,
+            "word_packets": decoder.word_packets - counters[0],
+            "bursts": decoder.bursts - counters[1],
+            "words_written": decoder.words_written - counters[2],
+            "image_words": len(image),
+            "image_sha1": hashlib.sha1(image.tobytes()).hexdigest(),
+            "image": image.tolist(),
+        }
+        with self.transfer_done:
+            self.reports.append(report)
+            self.transfer_done.notify_all()
+        if self.on_transfer is not None:
+            self.on_transfer(report)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Placa BIP-FPGA virtual em um pseudo-terminal")
+    parser.add_argument("--baud", type=int, default=9600, help="Taxa emulada (bps)")
+    parser.add_argument("--no-timing", action="store_true", help="Não limita a leitura à taxa da linha")
+    parser.add_argument("--transfers", type=int, default=0, help="Encerra após N transmissões (0 = nunca)")
+    args = parser.parse_args(argv)
+
+    def print_report(report):
+        print(json.dumps(report), flush=True)
+
+    with VirtualBoard(args.baud, not args.no_timing, on_transfer=print_report) as board:
+        # A primeira linha informa a porta, para scripts de teste e para o SerialGUI
+        print(json.dumps({"port": board.port, "baudrate": args.baud}), flush=True)
+        try:
+            if args.transfers:
+                board.wait_transfer(args.transfers)
+            else:
+                board.thread.join()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
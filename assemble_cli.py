@@ -0,0 +1,125 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from AssemblerCore import AssemblerCore
+from Linker import Linker, LinkException
+
+def assemble_one(source_path, output_dir, isa_config, encoding, optimize=False):
+    """
+    Monta um único arquivo e grava as saídas .bin, .cdm e .map (mapa de fonte).
+
+    :return: Tupla (caminho, nº de palavras, erros, relatório da otimização, segundos gastos).
+    """
+    start = time.perf_counter()
+
+    try:
+        result = AssemblerCore(isa_config).assemble_file(source_path, encoding, optimize)
+    except OSError as e:
+        return source_path, 0, [f"ERROR: {e}"], None, time.perf_counter() - start
+
+    if result.ok:
+        base = os.path.join(output_dir, os.path.splitext(os.path.basename(source_path))[0])
+        with open(base + ".bin", "wb") as bin_file:
+            bin_file.write(result.image.to_bin())
+        with open(base + ".cdm", "w") as cdm_file:
+            cdm_file.write(result.image.to_cdm())
+        with open(base + ".map", "w") as map_file:
+            map_file.write(result.image.to_map())
+
+    errors = [str(e) for e in result.errors]
+    report = str(result.optimization) if result.optimization else None
+    return source_path, len(result.image), errors, report, time.perf_counter() - start
+
+def link_program(main_path, output_dir, isa_config, encoding):
+    """Monta (com cache de objetos) e liga um programa de vários arquivos a partir do principal."""
+    start = time.perf_counter()
+    try:
+        result = Linker(isa_config, encoding).build(main_path)
+    except (LinkException, OSError) as e:
+        print(f"FAIL {main_path}\n{e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+
+    base = os.path.join(output_dir, os.path.splitext(os.path.basename(main_path))[0])
+    with open(base + ".bin", "wb") as bin_file:
+        bin_file.write(result.image.to_bin())
+    with open(base + ".cdm", "w") as cdm_file:
+        cdm_file.write(result.image.to_cdm())
+    with open(base + ".map", "w") as map_file:
+        map_file.write(result.to_map())
+
+    for address, name, size in result.segments:
+        print(f"     {address:03X}  {size:4} words  {name}")
+    print(f"OK   {main_path}: {len(result.image)} words in {elapsed * 1000:.2f} ms "
+          f"({result.assembled} montado(s), {result.cached} do cache)")
+    return 0
+
+def collect_sources(path):
+    """Lista os arquivos .asm de um diretório (ou o próprio arquivo)."""
+    if os.path.isfile(path):
+        return [path]
+    return sorted(
+        os.path.join(path, name) for name in os.listdir(path)
+        if name.lower().endswith(".asm")
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BIP-ACE: montagem em lote de arquivos .asm")
+    parser.add_argument("source", help="Arquivo .asm ou diretório com arquivos .asm")
+    parser.add_argument("-o", "--output", help="Diretório de saída (padrão: junto aos fontes)")
+    parser.add_argument("--isa", default="./configs/default_isa.json", help="Configuração da ISA (JSON)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Número de processos (padrão: nº de CPUs)")
+    parser.add_argument("--encoding", default="latin-1", help="Codificação dos arquivos fonte")
+    parser.add_argument("-O", "--optimize", action="store_true", help="Aplica a otimização peephole")
+    parser.add_argument("--link", action="store_true",
+                        help="Trata source como o arquivo principal de um programa com .include/.extern")
+    args = parser.parse_args(argv)
+
+    isa_config = AssemblerCore.load_isa(args.isa)
+
+    if args.link:
+        output_dir = args.output or os.path.dirname(args.source) or "."
+        os.makedirs(output_dir, exist_ok=True)
+        return link_program(args.source, output_dir, isa_config, args.encoding)
+
+    sources = collect_sources(args.source)
+    if not sources:
+        print(f"Nenhum arquivo .asm encontrado em {args.source}", file=sys.stderr)
+        return 1
+
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+
+    failures = 0
+    total_words = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = [
+            executor.submit(
+                assemble_one, path, args.output or os.path.dirname(path) or ".", isa_config, args.encoding,
+                args.optimize
+            )
+            for path in sources
+        ]
+
+        for future in futures:
+            path, word_count, errors, report, elapsed = future.result()
+            total_words += word_count
+            rate = word_count / elapsed if elapsed > 0 else 0.0
+            status = "OK" if not errors else "FAIL"
+            print(f"{status:4} {path}: {word_count} words in {elapsed * 1000:.2f} ms ({rate:,.0f} words/s)")
+            if report:
+                print(f"     {report}")
+            for error in errors:
+                print(f"     {error}")
+            failures += bool(errors)
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(sources)} arquivo(s), {failures} com erro, {total_words} palavras em {elapsed:.2f} s")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
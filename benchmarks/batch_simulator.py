@@ -0,0 +1,61 @@
+"""
+Compara o BatchSimulator (NumPy, todas as entradas em conjunto) com execuções
+individuais do BIPSimulator, conferindo que as saídas coincidem.
+
+Uso:
+    python benchmarks/batch_simulator.py [--vectors 5000] [--json saida.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from AssemblerCore import AssemblerCore
+from BatchSimulator import BatchSimulator
+from BIPSimulator import BIPSimulator
+
+PROGRAMS = (("jump_test.asm", 2), ("expression.asm", 1))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Execução em lote x execuções individuais")
+    parser.add_argument("--vectors", type=int, default=5000)
+    parser.add_argument("--json", help="Grava os resultados neste arquivo JSON")
+    args = parser.parse_args(argv)
+
+    isa_config = AssemblerCore.load_isa(os.path.join(ROOT, "configs", "default_isa.json"))
+    core = AssemblerCore(isa_config)
+    rng = np.random.default_rng(0)
+
+    results = []
+    for name, ports in PROGRAMS:
+        image = core.assemble_file(os.path.join(ROOT, "examples", name)).image
+        inputs = rng.integers(0, 2**12, size=(args.vectors, ports))
+
+        batch = BatchSimulator(image, isa_config).run(inputs)
+
+        start = time.perf_counter()
+        for row in range(args.vectors):
+            simulator = BIPSimulator(image, isa_config, inputs=dict(enumerate(inputs[row].tolist())),
+                                     record_outputs=False)
+            simulator.run(max_instructions=1_000_000)
+            for port, value in simulator.outputs.items():
+                assert batch.outputs[row, port] == value, f"{name}: linha {row} diverge na porta {port}"
+        scalar_seconds = time.perf_counter() - start
+
+        results.append({"program": name, "vectors": args.vectors, "batch_seconds": batch.seconds,
+                        "scalar_seconds": scalar_seconds, "speedup": scalar_seconds / batch.seconds})
+        print(f"{name:15} {args.vectors} vetores  lote {batch.seconds * 1000:8.1f} ms  "
+              f"individual {scalar_seconds * 1000:8.1f} ms  ({scalar_seconds / batch.seconds:5.0f}x)")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
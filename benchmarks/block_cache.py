@@ -0,0 +1,59 @@
+"""
+Ganho do cache de blocos básicos (BlockSimulator) sobre o despacho
+instrução a instrução (BIPSimulator), conferindo que o estado final coincide.
+
+Uso:
+    python benchmarks/block_cache.py [--instructions 5000000] [--json saida.json]
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from AssemblerCore import AssemblerCore
+from BIPSimulator import BIPSimulator
+from BlockSimulator import BlockSimulator
+from simulator_throughput import COUNTER_LOOP
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cache de blocos x despacho por instrução")
+    parser.add_argument("--instructions", type=int, default=5_000_000)
+    parser.add_argument("--json", help="Grava os resultados neste arquivo JSON")
+    args = parser.parse_args(argv)
+
+    isa_config = AssemblerCore.load_isa(os.path.join(ROOT, "configs", "default_isa.json"))
+    core = AssemblerCore(isa_config)
+
+    cases = [
+        ("fib_out.asm", core.assemble_file(os.path.join(ROOT, "examples", "fib_out.asm")).image, {0: 0, 1: 1}),
+        ("counter-loop", core.assemble(COUNTER_LOOP).image, {}),
+    ]
+
+    results = []
+    for name, image, inputs in cases:
+        runs = {}
+        for engine in (BIPSimulator, BlockSimulator):
+            simulator = engine(image, isa_config, inputs=inputs, record_outputs=False)
+            runs[engine] = (simulator, simulator.run(max_instructions=args.instructions))
+
+        (plain, plain_result), (cached, cached_result) = runs[BIPSimulator], runs[BlockSimulator]
+        assert (plain.acc, plain.pc, plain.memory, plain.outputs) == (cached.acc, cached.pc, cached.memory, cached.outputs), \
+            f"{name}: estados finais divergentes"
+
+        speedup = cached_result.ips / plain_result.ips
+        results.append({"program": name, "instructions": args.instructions,
+                        "dispatch_ips": plain_result.ips, "block_cache_ips": cached_result.ips,
+                        "blocks_translated": cached.translations, "speedup": speedup})
+        print(f"{name:14} despacho {plain_result.ips / 1e6:6.2f} M instr/s  "
+              f"blocos {cached_result.ips / 1e6:6.2f} M instr/s  "
+              f"({cached.translations} blocos, {speedup:.2f}x)")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
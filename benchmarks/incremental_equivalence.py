@@ -0,0 +1,142 @@
+"""
+Verificação aleatória da montagem incremental: aplica edições sucessivas
+(substituição, inserção e remoção de trechos, com rótulos duplicados,
+instruções inválidas e operandos fora da faixa) por update_text e
+update_lines, e confere a cada passo que imagem, linhas de origem, rótulos
+e erros coincidem com uma montagem completa do mesmo texto (com
+.include/.extern, com o objeto de Linker.assemble_object), tanto no
+resultado exportado (result) quanto nas consultas feitas sem exportar
+(errors, label_address, address_of, word).
+
+Uso:
+    python benchmarks/incremental_equivalence.py [--trials 200] [--edits 30] [--seed 0]
+
+Termina com código 1 e mostra o primeiro texto divergente, se houver.
+"""
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from AssemblerCore import AssemblerCore
+from FileIO import decode
+from IncrementalAssembler import IncrementalAssembler
+from ISACompiler import load_isa
+from Linker import assemble_object, has_directives
+from pipeline import generate_program
+
+# Linhas que exercitam os casos de erro e de redefinição
+EDGE_LINES = [
+    "loop:", "fim:", "  loop:", ":", "JUMP loop", "JUMP fim", "JNE fail", "fail:",
+    "LD nada", "FOO", "LD", "HLT", "LDI 5000", "ADDI 4095", "", "; comentário", "NOP ; fim",
+    ".org 5", ".include lib.asm", ".extern nada, fail", ".extern", " .include  ; sem arquivo",
+]
+
+def line_pool():
+    """Linhas dos exemplos, de um programa sintético e os casos de EDGE_LINES."""
+    pool = list(EDGE_LINES)
+    for path in sorted(glob.glob(os.path.join(ROOT, "examples", "*.asm"))):
+        with open(path, "rb") as file:
+            pool += decode(file.read())[0].split("\n")
+    pool += generate_program(200, seed=1).split("\n")
+    return pool
+
+def compare(incremental, full):
+    """Primeira diferença entre o estado incremental e o AssemblyResult da montagem completa, ou None."""
+    exported = incremental.result()
+    if list(exported.image.words) != list(full.image.words):
+        return "palavras"
+    if list(exported.image.source_lines) != list(full.image.source_lines):
+        return "linhas de origem"
+    if exported.labels != full.labels:
+        return "rótulos"
+    if [str(error) for error in exported.errors] != [str(error) for error in full.errors]:
+        return "erros"
+
+    # Consultas sem exportar
+    if [str(error) for error in incremental.errors.values()] != [str(error) for error in full.errors]:
+        return "errors"
+    if any(incremental.label_address(label) != address for label, address in full.labels.items()):
+        return "label_address"
+    words = dict(zip(full.image.source_lines, full.image.words))
+    for line in range(1, len(incremental.text_lines) + 1):
+        if incremental.word(line) != words.get(line):
+            return f"word({line})"
+        if line in words and incremental.address_of(line) is None:
+            return f"address_of({line})"
+    return None
+
+def compare_object(incremental, obj):
+    """Como compare, para documentos com diretivas: erros, símbolos e endereços do objeto relocável."""
+    if [str(error) for error in incremental.errors.values()] != [str(error) for error in obj.errors]:
+        return "erros (ligação)"
+    if incremental.labels != obj.symbols:
+        return "símbolos"
+    if [incremental.address_of(line) for line in obj.source_lines] != list(range(len(obj.source_lines))):
+        return "endereços (ligação)"
+    return None
+
+def run(isa, trials, edits, seed):
+    """Executa as verificações; retorna (passos conferidos, falha ou None)."""
+    rng = random.Random(seed)
+    pool = line_pool()
+    core = AssemblerCore(isa)
+    checked = 0
+
+    for trial in range(trials):
+        incremental = IncrementalAssembler(isa)
+        lines = rng.sample(pool, rng.randint(1, 60))
+        incremental.update_text("\n".join(lines))
+
+        for step in range(edits + 1):
+            if step:
+                # Substitui até 4 linhas por até 4 linhas (inserção e remoção inclusas)
+                first = rng.randint(0, len(lines))
+                last = rng.randint(first, min(len(lines), first + 4))
+                new_lines = rng.sample(pool, rng.randint(0, 4))
+                if not new_lines and len(lines) - (last - first) == 0:
+                    new_lines = [""]     # O editor sempre tem ao menos uma linha
+                lines[first:last] = new_lines
+                if rng.random() < 0.5:
+                    incremental.update_text("\n".join(lines))
+                else:
+                    incremental.update_lines(first + 1, last, new_lines)
+
+            text = "\n".join(lines)
+            if has_directives(text):
+                difference = compare_object(incremental, assemble_object(core, lines, "documento"))
+            else:
+                difference = compare(incremental, core.assemble(text))
+            checked += 1
+            if difference is not None:
+                return checked, (trial, step, difference, text)
+
+    return checked, None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Montagem incremental x montagem completa")
+    parser.add_argument("--trials", type=int, default=200, help="Programas iniciais aleatórios")
+    parser.add_argument("--edits", type=int, default=30, help="Edições por programa")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    isa = load_isa(os.path.join(ROOT, "configs", "default_isa.json"))
+    start = time.perf_counter()
+    checked, failure = run(isa, args.trials, args.edits, args.seed)
+    elapsed = time.perf_counter() - start
+
+    if failure is not None:
+        trial, step, difference, text = failure
+        print(f"Divergência ({difference}) no programa {trial}, edição {step} (--seed {args.seed}):")
+        print(text)
+        return 1
+    print(f"{checked} estados conferidos em {elapsed:.2f} s: montagem incremental equivalente")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
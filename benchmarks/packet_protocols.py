@@ -0,0 +1,97 @@
+"""
+Compara o protocolo padrão (um pacote por palavra) com o protocolo em rajada,
+usando o PacketDecoder como receptor de referência (nenhuma placa necessária).
+
+Para cada imagem, mede os bytes na linha, o tempo de linha estimado e a
+vazão de codificação/decodificação, e confere a memória recebida.
+
+Uso:
+    python benchmarks/packet_protocols.py [--baud 9600] [--json saida.json]
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from AssemblerCore import AssemblerCore
+from PacketDecoder import PacketDecoder
+from SerialCommunicator import SerialCommunicator
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - start) / repeat
+
+def run_case(name, pairs, baudrate, repeat):
+    results = []
+    for protocol in (SerialCommunicator.PROTOCOL_WORD, SerialCommunicator.PROTOCOL_BURST):
+        communicator = SerialCommunicator("loopback", baudrate, protocol=protocol)
+
+        if protocol == SerialCommunicator.PROTOCOL_BURST:
+            stream, encode_s = timed(lambda: communicator.generate_burst_stream(pairs), repeat)
+        else:
+            stream, encode_s = timed(
+                lambda: communicator.pack_packets(communicator.generate_data_packet(pairs)), repeat
+            )
+
+        def decode():
+            decoder = PacketDecoder()
+            decoder.feed(stream)
+            return decoder
+        decoder, decode_s = timed(decode, repeat)
+
+        assert decoder.transfers == 1, f"{name}/{protocol}: EOT não recebido"
+        for address, data in pairs:
+            assert decoder.memory[address] == data, f"{name}/{protocol}: palavra {address} divergente"
+
+        results.append({
+            "image": name,
+            "protocol": protocol,
+            "words": len(pairs),
+            "wire_bytes": len(stream),
+            "line_seconds": len(stream) * communicator.char_time(),
+            "encode_us": encode_s * 1e6,
+            "decode_us": decode_s * 1e6,
+        })
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Protocolo padrão x rajada com o receptor de referência")
+    parser.add_argument("--baud", type=int, default=9600)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="Grava os resultados neste arquivo JSON")
+    args = parser.parse_args(argv)
+
+    core = AssemblerCore(AssemblerCore.load_isa(os.path.join(ROOT, "configs", "default_isa.json")))
+    cases = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "examples", "*.asm"))):
+        result = core.assemble_file(path)
+        if result.ok:
+            cases.append((os.path.basename(path), list(result.image.pairs())))
+
+    rng = random.Random(0)
+    full = [(address, rng.randrange(2**16)) for address in range(2**12)]
+    cases.append(("synthetic-4096", full))
+    cases.append(("scattered-3", [full[10], full[11], full[900]]))
+
+    results = []
+    for name, pairs in cases:
+        for result in run_case(name, pairs, args.baud, args.repeat):
+            results.append(result)
+            print(f"{result['image']:16} {result['protocol']:5} {result['words']:>5} palavras "
+                  f"{result['wire_bytes']:>6} B  {result['line_seconds']:7.3f} s @ {args.baud}  "
+                  f"enc {result['encode_us']:9.1f} us  dec {result['decode_us']:9.1f} us")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Linha de base de desempenho do caminho editor -> montador -> placa.
+
+Gera programas BIP sintéticos (rótulos, comentários e saltos no estilo de
+examples/) de 100 a 4096 instruções e mede cada etapa:
+
+- montagem (completa, otimizada, incremental e edição de uma linha) e diagnóstico
+- destaque de sintaxe e números de linha, sem widgets (tokenizador e texto do painel)
+- geração de pacotes (protocolo padrão e rajada)
+- envio por um loopback em pseudo-terminal (VirtualBoard; Linux/macOS)
+- com um display disponível (ex.: xvfb-run), também o editor real:
+  highlight_syntax, update_line_numbers e assemble_code
+
+Os resultados são gravados em JSON para comparação entre execuções.
+
+Uso:
+    python benchmarks/pipeline.py [--sizes 100 512 1024 4096] [--repeat 5] [--no-gui] [--json saida.json]
+    xvfb-run python benchmarks/pipeline.py --json saida.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from AssemblerCore import AssemblerCore
+from Diagnostics import diagnose
+from IncrementalAssembler import IncrementalAssembler
+from ISACompiler import load_isa
+from SerialCommunicator import SerialCommunicator
+from SyntaxHighlighter import tokenize_line
+
+SIZES = (100, 512, 1024, 4096)
+
+def generate_program(instructions, seed=0):
+    """
+    Programa sintético com `instructions` instruções: blocos rotulados de
+    E/S, aritmética e comparação, encerrados por saltos para outros blocos.
+    """
+    rng = random.Random(seed)
+    lines = ["; PROGRAMA SINTÉTICO", f"; {instructions} instruções", ""]
+    block = 0
+    count = 0
+
+    while count < instructions:
+        lines.append(f"; BLOCO {block}")
+        lines.append(f"block{block}:")
+        for _ in range(min(rng.randint(4, 12), instructions - count - 1)):
+            address = f"{rng.randrange(64):04d}"
+            instr = rng.choice(("LD", "STO", "ADD", "SUB", "IN", "OUT", "LDI", "ADDI", "SUBI"))
+            operand = f"{rng.randrange(2**12):04d}" if instr in ("LDI", "ADDI", "SUBI") else address
+            comment = f" ; x{rng.randrange(2**16):04X}" if rng.random() < 0.2 else ""
+            lines.append(f"{instr:4} {operand}{comment}")
+            count += 1
+
+        if count == instructions - 1:
+            lines.append("HLT  0000")
+            count += 1
+        else:
+            # Laços para blocos anteriores; saltos para o bloco seguinte apenas se ele existir
+            compare = rng.random() < 0.5 and count < instructions - 2
+            forward = count + compare + 1 < instructions and rng.random() < 0.5
+            target = block + 1 if forward else rng.randrange(block + 1)
+            if compare:
+                lines.append(f"CMP  {rng.randrange(64):04d}")
+                lines.append(f"{rng.choice(('JNE', 'JL', 'JG')):4} block{target}")
+            else:
+                lines.append(f"JUMP block{target}")
+            count += compare + 1
+        lines.append("")
+        block += 1
+
+    return "\n".join(lines)
+
+def measure(function, repeat, setup=None):
+    """Tempos (ms) de `repeat` execuções; setup (opcional) roda antes de cada uma, fora da medição."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1e3)
+    return {"median_ms": statistics.median(times), "min_ms": min(times), "repeat": repeat}
+
+def headless_stages(isa, source, repeat):
+    """Etapas sem interface gráfica: (nome, medição)."""
+    core = AssemblerCore(isa)
+    lines = source.split("\n")
+    result = core.assemble(source)
+    assert result.ok, result.errors[:3]
+    pairs = list(result.image.pairs())
+
+    incremental = IncrementalAssembler(isa)
+    incremental.update_text(source)
+    # Edição de uma linha no meio do programa, alternando entre duas versões
+    edit_line = next(index for index in range(len(lines) // 2, len(lines)) if lines[index].startswith("LD "))
+    versions = ["LD   0063", lines[edit_line]]
+
+    def edit():
+        versions.reverse()
+        incremental.update_lines(edit_line + 1, edit_line + 1, versions[:1])
+
+    def assemble_incremental():
+        assembler = IncrementalAssembler(isa)
+        assembler.update_text(source)
+        return assembler.result()
+
+    word = SerialCommunicator(None, protocol=SerialCommunicator.PROTOCOL_WORD)
+    burst = SerialCommunicator(None, protocol=SerialCommunicator.PROTOCOL_BURST)
+
+    yield "assemble", measure(lambda: core.assemble(source), repeat)
+    yield "assemble_optimized", measure(lambda: core.assemble(source, optimize=True), repeat)
+    yield "incremental_full", measure(assemble_incremental, repeat)
+    yield "incremental_edit", measure(edit, repeat)
+    yield "diagnostics", measure(lambda: diagnose(isa, source), repeat)
+    yield "tokenize", measure(lambda: [tokenize_line(isa.token_regex, line) for line in lines], repeat)
+    yield "gutter_text", measure(lambda: "\n".join(str(i) for i in range(1, len(lines) + 1)), repeat)
+    yield "packets_word", measure(lambda: word.pack_packets(word.generate_data_packet(pairs)), repeat)
+    yield "packets_burst", measure(lambda: burst.generate_burst_stream(pairs), repeat)
+
+    if hasattr(os, "openpty"):
+        for communicator in (word, burst):
+            yield f"send_{communicator.protocol}", measure_send(communicator, pairs, repeat)
+
+def measure_send(encoder, pairs, repeat, baudrate=921600):
+    """Envio em bloco pelo loopback pty, até a placa virtual confirmar o EOT."""
+    from VirtualBoard import VirtualBoard
+
+    buffer = encoder.encode_image(pairs)
+    with VirtualBoard(baudrate, enforce_timing=False) as board:
+        communicator = SerialCommunicator(board.port, baudrate, mode=SerialCommunicator.MODE_BULK)
+        transfers = []
+
+        def send():
+            communicator.send_serial_data(buffer)
+            transfers.append(board.wait_transfer(len(transfers) + 1, timeout=60))
+
+        result = measure(send, repeat)
+        assert transfers[-1]["image"] == [data for _, data in pairs], "imagem corrompida no loopback"
+    result["bytes"] = len(buffer)
+    return result
+
+def open_editor():
+    """Editor real em uma janela oculta, ou None sem display."""
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    root.withdraw()
+
+    from AssemblyEditor import AssemblyEditor
+    os.chdir(ROOT)  # O editor carrega configs/ e assets/ por caminhos relativos
+    editor = AssemblyEditor(root)
+    editor.live_diagnostics.set(False)
+    return editor
+
+def editor_stages(editor, source, repeat):
+    """Etapas no editor real (requer display)."""
+    import tkinter as tk
+
+    editor.text_area.delete("1.0", tk.END)
+    editor.text_area.insert("1.0", source)
+
+    def clear_gutter():
+        editor.line_numbers.config(state=tk.NORMAL)
+        editor.line_numbers.delete("1.0", tk.END)
+        editor.gutter_lines = 0
+
+    def assemble():
+        if editor.assembler is not None:
+            editor.assembler.incremental = None     # Montagem a frio, reutilizando a janela de listagem
+        editor.assemble_code()
+        editor.root.update_idletasks()
+
+    yield "editor_highlight", measure(editor.highlight_syntax, repeat)
+    yield "editor_gutter", measure(editor.update_line_numbers, repeat, setup=clear_gutter)
+    yield "editor_assemble", measure(assemble, repeat)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Linha de base: montagem, editor, pacotes e envio")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-gui", action="store_true", help="Não mede o editor, mesmo com display")
+    parser.add_argument("--json", help="Grava os resultados neste arquivo JSON")
+    args = parser.parse_args(argv)
+
+    isa = load_isa(os.path.join(ROOT, "configs", "default_isa.json"))
+    editor = None if args.no_gui else open_editor()
+    if editor is None:
+        print("Editor: sem display, apenas etapas sem interface gráfica")
+
+    results = []
+    for size in args.sizes:
+        source = generate_program(size, seed=size)
+        stages = list(headless_stages(isa, source, args.repeat))
+        if editor is not None:
+            stages += list(editor_stages(editor, source, args.repeat))
+
+        for stage, timing in stages:
+            results.append({"instructions": size, "stage": stage, **timing})
+            print(f"{size:>5} instr  {stage:20} {timing['median_ms']:9.3f} ms  (mín. {timing['min_ms']:.3f})")
+
+    if editor is not None:
+        editor.root.destroy()
+
+    if args.json:
+        report = {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "gui": editor is not None,
+            "results": results,
+        }
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark de vazão do SerialCommunicator contra um loopback em pseudo-terminal.
+
+A placa virtual (VirtualBoard) consome os bytes no ritmo da linha (8N1), de
+modo que os números refletem o tempo real de envio em cada modo de transmissão.
+
+Uso (Linux/macOS):
+    python benchmarks/serial_throughput.py [--bauds 9600 115200 921600] [--json saida.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from SerialCommunicator import SerialCommunicator
+from VirtualBoard import VirtualBoard
+
+def run_case(baudrate, mode, words):
+    with VirtualBoard(baudrate) as board:
+        communicator = SerialCommunicator(board.port, baudrate, mode=mode)
+        pairs = [(address, address & 0xFFFF) for address in range(words)]
+
+        start = time.perf_counter()
+        communicator.assemble_and_send(pairs)
+        report = board.wait_transfer(timeout=60)
+        elapsed = time.perf_counter() - start
+
+        assert report["image"] == [data for _, data in pairs], "imagem corrompida no loopback"
+
+        return {
+            "baudrate": baudrate,
+            "mode": mode,
+            "bytes": report["bytes"],
+            "seconds": elapsed,
+            "bytes_per_s": report["bytes"] / elapsed,
+            "line_rate_bytes_per_s": baudrate / 10,
+            "efficiency": (report["bytes"] / elapsed) / (baudrate / 10),
+            "stalls": report["stalls"],
+        }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vazão do SerialCommunicator em loopback pty")
+    parser.add_argument("--bauds", type=int, nargs="+", default=[9600, 115200, 921600])
+    parser.add_argument("--seconds", type=float, default=0.25, help="Tempo de linha alvo por caso")
+    parser.add_argument("--json", help="Grava os resultados neste arquivo JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    for baudrate in args.bauds:
+        # Imagem dimensionada para ~args.seconds de tempo de linha (máx. 4096 palavras)
+        words = max(16, min(4096, int(baudrate / 10 * args.seconds / 4)))
+        for mode in (SerialCommunicator.MODE_BYTE, SerialCommunicator.MODE_BULK):
+            result = run_case(baudrate, mode, words)
+            results.append(result)
+            print(f"{baudrate:>7} bps  {mode:5}  {result['bytes']:>6} B  {result['seconds']:7.3f} s  "
+                  f"{result['bytes_per_s']:>10,.0f} B/s  ({result['efficiency']:.0%} da linha)")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
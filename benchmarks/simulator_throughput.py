@@ -0,0 +1,69 @@
+"""
+Vazão do BIPSimulator (instruções por segundo) em laços no estilo de examples/fib_out.asm.
+
+Uso:
+    python benchmarks/simulator_throughput.py [--instructions 5000000] [--json saida.json]
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from AssemblerCore import AssemblerCore
+from BIPSimulator import BIPSimulator
+
+# Laço de contagem com todas as classes de instrução do caminho crítico
+COUNTER_LOOP = """
+    LDI  0
+    STO  0000
+    LDI  4095
+    STO  0001
+loop:
+    LD   0000
+    ADDI 1
+    STO  0000
+    SUBI 1
+    ADD  0000
+    SUB  0000
+    OUT  0000
+    CMP  0001
+    JNE  loop
+    NOP
+    JUMP loop
+"""
+
+TARGET_IPS = 2_000_000
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vazão do simulador da BIP-I")
+    parser.add_argument("--instructions", type=int, default=5_000_000)
+    parser.add_argument("--json", help="Grava os resultados neste arquivo JSON")
+    args = parser.parse_args(argv)
+
+    isa_config = AssemblerCore.load_isa(os.path.join(ROOT, "configs", "default_isa.json"))
+    core = AssemblerCore(isa_config)
+
+    cases = [
+        ("fib_out.asm", core.assemble_file(os.path.join(ROOT, "examples", "fib_out.asm")), {0: 0, 1: 1}),
+        ("counter-loop", core.assemble(COUNTER_LOOP), {}),
+    ]
+
+    results = []
+    for name, assembly, inputs in cases:
+        simulator = BIPSimulator(assembly.image, isa_config, inputs=inputs, record_outputs=False)
+        result = simulator.run(max_instructions=args.instructions)
+        results.append({"program": name, "instructions": result.instructions,
+                        "seconds": result.seconds, "ips": result.ips})
+        status = "ok" if result.ips >= TARGET_IPS else "ABAIXO DA META"
+        print(f"{name:14} {result.instructions:>10} instr  {result.seconds:6.2f} s  "
+              f"{result.ips / 1e6:6.2f} M instr/s  [{status}]")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,45 @@
+import time
+_start = time.perf_counter()
+
+import json
+import sys
 import tkinter as tk
 from AssemblyEditor import AssemblyEditor
 
-if __name__ == "__main__":
+def measure_startup(import_time):
+    """
+    Modo de medição da inicialização (python main.py --startup-time):
+    imprime em JSON o tempo de cada etapa até a primeira pintura da janela.
+    """
+    start = time.perf_counter()
     root = tk.Tk()
+    tk_time = time.perf_counter() - start
+
+    start = time.perf_counter()
     editor = AssemblyEditor(root)
-    root.mainloop()
\ No newline at end of file
+    editor_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    root.update()   # Processa os eventos pendentes: mapeamento e primeira pintura
+    paint_time = time.perf_counter() - start
+
+    report = {
+        "import": import_time,
+        "tk": tk_time,
+        **editor.startup_times,
+        "editor_total": editor_time,
+        "first_paint": paint_time,
+        "total": time.perf_counter() - _start,
+        # Módulos que devem ser importados apenas no primeiro uso
+        "lazy_modules_loaded": [name for name in ("serial", "PIL") if name in sys.modules],
+    }
+    root.destroy()
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    if "--startup-time" in sys.argv:
+        measure_startup(time.perf_counter() - _start)
+    else:
+        root = tk.Tk()
+        editor = AssemblyEditor(root)
+        root.mainloop()
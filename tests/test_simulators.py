@@ -0,0 +1,57 @@
+"""
+Equivalência entre os simuladores: BIPSimulator, BlockSimulator e BatchSimulator
+devem produzir as mesmas saídas para o mesmo programa e as mesmas entradas.
+
+Uso:
+    python -m pytest tests
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from AssemblerCore import AssemblerCore
+from BatchSimulator import BatchSimulator
+from BIPSimulator import BIPSimulator, DEFAULT_ISA
+from BlockSimulator import BlockSimulator
+
+# Soma das portas IN 0, 1 e 2 em OUT 0; OUT 1 recebe a porta 2
+PROGRAM = """
+IN 0
+STO 0
+IN 1
+ADD 0
+STO 0
+IN 2
+OUT 1
+ADD 0
+OUT 0
+HLT
+"""
+
+def assemble():
+    isa = AssemblerCore.load_isa(DEFAULT_ISA)
+    result = AssemblerCore(isa).assemble(PROGRAM)
+    assert result.ok, result.errors
+    return isa, result.image
+
+def scalar_outputs(simulator_class, isa, image, inputs):
+    simulator = simulator_class(image, isa, inputs=inputs)
+    assert simulator.run(max_instructions=1000).halted
+    return {port: simulator.outputs.get(port, 0) for port in (0, 1)}
+
+def test_short_inputs_read_as_zero():
+    """Com menos entradas que portas IN lidas, as portas restantes valem 0 em todos os simuladores."""
+    isa, image = assemble()
+    cases = [[7, 5, 3], [7, 5], [7], []]
+
+    batch = BatchSimulator(image, isa)
+    for inputs in cases:
+        expected = {0: sum(inputs), 1: inputs[2] if len(inputs) > 2 else 0}
+        assert scalar_outputs(BIPSimulator, isa, image, inputs) == expected
+        assert scalar_outputs(BlockSimulator, isa, image, inputs) == expected
+
+        result = batch.run([inputs] if inputs else [[]])
+        assert result.halted.all()
+        assert {port: int(result.outputs[0, port]) for port in (0, 1)} == expected